@@ -0,0 +1,131 @@
+import json
+
+import streamlit as st
+
+from dataset_cache import hash_export, load_cleaning_data_cached
+from parallel_loading import load_many
+from player_filters import apply_filter, spec_key
+from evaluate_players_by_position import (evaluate_players_by_position, evaluate_position_groups, position_group_table,
+                                          replacement_matrix)
+from stat_percentiles import stat_table, table_stats
+from squad_review import API_KEY_VARIABLE, ReviewService, review_backend
+
+
+# Bounds of the in-memory caches of the Streamlit app. Results are shared
+# between reruns and sessions, and keyed by the content of their inputs.
+MAX_DATASETS = 8
+MAX_RESULTS = 64
+TTL_SECONDS = 60 * 60
+
+
+def export_digest(uploaded_file):
+    """
+    Content hash of an uploaded export, computed once per upload.
+    """
+    digests = st.session_state.setdefault("export_digests", {})
+    if uploaded_file.file_id not in digests:
+        digests[uploaded_file.file_id] = hash_export(uploaded_file)
+    return digests[uploaded_file.file_id]
+
+
+@st.cache_resource(max_entries=MAX_DATASETS, ttl=TTL_SECONDS, show_spinner="Loading data...")
+def _load(dataset_key, chunk_rows, _uploaded_files):
+    squad = dataset_key[-1]
+    if len(_uploaded_files) > 1:
+        df = load_many(_uploaded_files, squad=squad, compact=True)
+    else:
+        df = load_cleaning_data_cached(_uploaded_files[0], squad=squad, chunk_rows=chunk_rows, compact=True)
+    # Percentiles are ranked with the load, and kept as long as the dataset
+    stat_table(df, table_stats(df))
+    return df
+
+
+def load_dataset(uploaded_files, squad=False, chunk_rows=None):
+    """
+    Loads one or several uploaded exports, once per content.
+
+    Returns:
+        tuple: The compact dataset and its key, the hashes of the exports,
+        used to key the filter and evaluation results of the dataset.
+    """
+    dataset_key = tuple(export_digest(uploaded_file) for uploaded_file in uploaded_files) + (squad,)
+    return _load(dataset_key, chunk_rows, list(uploaded_files)), dataset_key
+
+
+@st.cache_resource(max_entries=MAX_RESULTS, ttl=TTL_SECONDS, show_spinner=False)
+def _filter(dataset_key, filter_key, _df, _spec):
+    return apply_filter(_df, _spec)
+
+
+def filter_dataset(df, dataset_key, spec):
+    """
+    Players of a dataset selected by a filter spec, once per (dataset, spec).
+    """
+    return _filter(dataset_key, spec_key(spec), df, spec)
+
+
+@st.cache_resource(max_entries=MAX_RESULTS, ttl=TTL_SECONDS, show_spinner="Evaluating players...")
+def _evaluate(dataset_key, filter_key, weights_key, top_k, normalization, _df, _stat_weights, _dataset):
+    return evaluate_players_by_position(_df, _stat_weights, top_k=top_k, normalization=normalization, dataset=_dataset)
+
+
+def evaluate_filtered(df, dataset_key, spec, stat_weights, top_k=None, normalization='raw', dataset=None):
+    """
+    Evaluation of the filtered players of a dataset, once per (dataset, spec, weights, top_k, normalization).
+    dataset is the dataset of dataset_key, the players are ranked in for a normalization.
+    """
+    weights_key = json.dumps(stat_weights, sort_keys=True)
+    return _evaluate(dataset_key, spec_key(spec), weights_key, top_k, normalization, df, stat_weights, dataset)
+
+
+@st.cache_resource(max_entries=MAX_RESULTS, ttl=TTL_SECONDS, show_spinner="Ranking players by position...")
+def _evaluate_groups(dataset_key, filter_key, weights_key, normalization, _df, _stat_weights, _dataset):
+    return evaluate_position_groups(_df, _stat_weights, normalization=normalization, dataset=_dataset)
+
+
+@st.cache_resource(max_entries=MAX_RESULTS, ttl=TTL_SECONDS, show_spinner=False)
+def _group_table(dataset_key, filter_key, weights_key, normalization, group, _df, _grouped, _stat_weights):
+    return position_group_table(_df, _grouped, group, _stat_weights)
+
+
+def evaluate_group_filtered(df, dataset_key, spec, stat_weights, group, normalization='raw', dataset=None):
+    """
+    Leaderboard of a position group of the filtered players of a dataset, from
+    the per-position ranking of all groups, computed once per (dataset, spec,
+    weights, normalization).
+
+    Returns:
+        tuple: The leaderboard of the group and the ranking of all groups.
+    """
+    keys = (dataset_key, spec_key(spec), json.dumps(stat_weights, sort_keys=True), normalization)
+    grouped = _evaluate_groups(*keys, df, stat_weights, dataset)
+    return _group_table(*keys, group, df, grouped, stat_weights), grouped
+
+
+@st.cache_resource(max_entries=MAX_RESULTS, ttl=TTL_SECONDS, show_spinner="Finding replacements...")
+def _replacements(scout_key, squad_key, stats, top_k, same_position, filter_key, _df_scout, _df_squad, _spec):
+    return replacement_matrix(_df_scout, _df_squad, list(stats), top_k, same_position, _spec)
+
+
+def squad_replacements(df_scout, scout_key, df_squad, squad_key, stats, top_k=5, same_position=False, spec=None):
+    """
+    Replacement candidates of every squad player, among the scouted players selected
+    by spec (all of them if None), once per (datasets, stats, top_k, same_position, spec).
+    """
+    filter_key = None if spec is None else spec_key(spec)
+    return _replacements(scout_key, squad_key, tuple(stats), top_k, same_position, filter_key, df_scout, df_squad, spec)
+
+
+@st.cache_resource
+def review_service():
+    """
+    Service generating the squad reviews of the app in the background, shared between
+    reruns and sessions. The API key is read from the Streamlit secrets or the
+    environment, the reviews are stubbed if there is none.
+    """
+    try:
+        api_key = st.secrets.get(API_KEY_VARIABLE)
+    except FileNotFoundError:
+        # No secrets.toml
+        api_key = None
+    return ReviewService(review_backend(api_key))
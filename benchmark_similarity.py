@@ -0,0 +1,114 @@
+"""
+Recall and speed of the approximate similarity search of ivf_index.py,
+against the exact cosine_similarity, on scouting exports or on a
+synthetic pool of players.
+
+    python benchmark_similarity.py scouting_2026.html scouting_2027.html
+    python benchmark_similarity.py --synthetic 1000000 --k 10 --n-probe 1 4 16 64
+
+For every n_probe it reports recall@k, the share of the exact k most
+similar players found by the approximate search (averaged over the query
+players, players tied with the k-th counting as found), and the mean time
+of a query. Exact query times include the full cosine_similarity of the
+pool, computed EXACT_BATCH queries at a time.
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from evaluate_players_by_position import SIMILARITY_STATS
+from ivf_index import IVFIndex
+from player_index import PLAYER_ID
+
+
+# Query players whose exact similarities are computed at a time
+EXACT_BATCH = 16
+# Similarities this close are ties, the index stores vectors as float32
+TIE_TOLERANCE = 1e-6
+
+
+def synthetic_pool(n_players, stats, seed=0):
+    """
+    Pool of n_players with non-negative stats drawn from a mixture of player profiles.
+    """
+    rng = np.random.default_rng(seed)
+    profiles = rng.gamma(2.0, 1.0, size=(64, len(stats)))
+    values = profiles[rng.integers(len(profiles), size=n_players)] * rng.lognormal(0, 0.3, size=(n_players, len(stats)))
+    df = pd.DataFrame(values, columns=stats)
+    df.index.name = PLAYER_ID
+    return df
+
+
+def exact_thresholds(values, queries, k):
+    """
+    Similarity of the k-th most similar player to every query, with cosine_similarity.
+    """
+    thresholds = []
+    for start in range(0, len(queries), EXACT_BATCH):
+        scores = cosine_similarity(values, queries[start:start + EXACT_BATCH])
+        thresholds.extend(np.partition(scores, len(scores) - k, axis=0)[len(scores) - k])
+    return np.array(thresholds)
+
+
+def recall_at_k(values, query, rows, threshold, k):
+    """
+    Share of the k most similar players found, counting players tied with the
+    k-th one as found, since any of them can be among the exact k.
+    """
+    scores = cosine_similarity(values[rows], query.reshape(1, -1))[:, 0]
+    return np.count_nonzero(scores >= threshold - TIE_TOLERANCE) / k
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('exports', nargs='*', help="Scouting exports pooled into one dataset")
+    parser.add_argument('--synthetic', type=int, default=200_000, help="Players of a synthetic pool, without exports")
+    parser.add_argument('--stats', nargs='+', default=SIMILARITY_STATS)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--n-lists', type=int, default=None)
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    if args.exports:
+        from parallel_loading import load_many
+        df = load_many(args.exports, compact=True)
+    else:
+        df = synthetic_pool(args.synthetic, args.stats)
+    values = df[args.stats].to_numpy(dtype=np.float64)
+    queries = values[np.random.default_rng(1).choice(len(values), min(args.queries, len(values)), replace=False)]
+    print(f"{len(df):,} players, {len(args.stats)} stats, {len(queries)} queries, k={args.k}")
+
+    start = time.perf_counter()
+    thresholds = exact_thresholds(values, queries, args.k)
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    start = time.perf_counter()
+    index = IVFIndex.build(df, args.stats, n_lists=args.n_lists)
+    print(f"Index of {len(index.centroids)} lists built in {time.perf_counter() - start:.1f} s")
+
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        index = IVFIndex.load(path)
+
+        results = [{'Search': 'exact (cosine_similarity)', 'Recall@k': 1.0, 'Query ms': exact_ms}]
+        positions = pd.Index(df.index)
+        for n_probe in args.n_probe:
+            start = time.perf_counter()
+            found = [index.query(query, args.k, n_probe)[0] for query in queries]
+            elapsed = time.perf_counter() - start
+            recall = sum(recall_at_k(values, query, positions.get_indexer(ids), threshold, args.k)
+                         for query, ids, threshold in zip(queries, found, thresholds))
+            results.append({'Search': f"IVF, n_probe={n_probe}", 'Recall@k': recall / len(queries),
+                            'Query ms': elapsed / len(queries) * 1000})
+        del index
+
+    print(pd.DataFrame(results).round({'Recall@k': 3, 'Query ms': 2}).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
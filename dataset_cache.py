@@ -0,0 +1,151 @@
+import hashlib
+import os
+import tempfile
+
+import pandas as pd
+
+from load_cleaning_data import load_cleaning_data, CLEANING_VERSION
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FM_ANALYTICS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'fm_analytics'))
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GB
+
+
+def hash_export(data_path, chunk_size=1 << 20):
+    """
+    Computes the SHA-256 of an export, from a path or a file-like object.
+    File-like objects are rewound so they can be parsed afterwards.
+    """
+    digest = hashlib.sha256()
+    if hasattr(data_path, 'getvalue'):
+        value = data_path.getvalue()
+        digest.update(value.encode('utf-8') if isinstance(value, str) else value)
+    elif hasattr(data_path, 'read'):
+        # Text files return '' at the end, binary files b''
+        while chunk := data_path.read(chunk_size):
+            digest.update(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        data_path.seek(0)
+    else:
+        with open(data_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """
+    Content-addressed on-disk cache of cleaned datasets.
+
+    Entries are keyed by the hash of the export bytes and the loading
+    arguments, and stored as Feather files. The cleaning version is part
+    of every file name, so entries written by an older cleaning logic are
+    never read and are removed on the next write. When the cache grows
+    over max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, data_path, free_agent_day='30/6/2026', squad=False, compact=False):
+        """
+        Returns the cache key of an export loaded with the given arguments.
+        """
+        return hashlib.sha256(
+            f"{hash_export(data_path)}|{free_agent_day}|{bool(squad)}|{bool(compact)}".encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"v{CLEANING_VERSION}-{key}.feather")
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith('.feather')]
+
+    def get(self, key):
+        """
+        Returns the cached dataset for a key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            df = pd.read_feather(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        if df['Position'].dtype == object:
+            df['Position'] = df['Position'].apply(set)
+        return df
+
+    def put(self, key, df):
+        """
+        Stores a cleaned dataset and evicts stale or least recently used entries.
+        """
+        stored = df.copy()
+        # Arrow has no set type, positions are stored as sorted lists
+        # (compact datasets store position masks, which need no conversion)
+        if stored['Position'].dtype == object:
+            stored['Position'] = stored['Position'].apply(sorted)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            stored.to_feather(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes entries of other cleaning versions, then the least
+        recently used entries until the cache fits in max_bytes.
+        """
+        prefix = f"v{CLEANING_VERSION}-"
+        entries = []
+        for entry in self._entries():
+            if entry.name.startswith(prefix):
+                entries.append(entry)
+            else:
+                os.remove(entry.path)
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def clear(self):
+        for entry in self._entries():
+            os.remove(entry.path)
+
+
+def load_cleaning_data_cached(data_path, free_agent_day='30/6/2026', squad=False, cache=None, chunk_rows=None,
+                              compact=False):
+    """
+    Same as load_cleaning_data, but reuses the cleaned dataset of an
+    export that was already loaded with the same arguments.
+
+    Parameters:
+        data_path (str or file-like): Path or file object of the HTML export.
+        free_agent_day (str): Default contract expiration date for missing values (format 'DD/MM/YYYY').
+        squad (bool): If True, loads squad data; otherwise, loads scouting report data.
+        cache (DatasetCache): Cache to use, a cache in the default directory if None.
+        chunk_rows (int): If set, a dataset that is not cached is loaded in batches of chunk_rows players.
+        compact (bool): If True, the dataset is loaded in the compact layout of compact_dataset.
+    Returns:
+        pd.DataFrame: The cleaned dataset.
+    """
+    if cache is None:
+        cache = DatasetCache()
+
+    key = cache.key(data_path, free_agent_day, squad, compact)
+    df = cache.get(key)
+    if df is None:
+        df = load_cleaning_data(data_path, free_agent_day, squad, chunk_rows, compact=compact)
+        cache.put(key, df)
+    return df
@@ -1,60 +1,116 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics.pairwise import cosine_similarity
+from positions import POSITION_GROUPS, POSITION_PROFILES, group_membership, position_masks, with_readable_positions
+from player_index import PLAYER_ID, player_row
+from load_cleaning_data import with_columns
+from stat_percentiles import stat_table
+from similarity_index import similarity_index
+from player_filters import filter_rows
+from table_sorting import rank_rows
 
 
-def similarity_calculation(df_scout,df_squad, player_name, stats=['Age', 'Salary', 'Hdrs W/90', 'K Hdrs/90', 'Aer A/90', 'NP-xG/90', 'ShT/90', 'Conv %', 'xG-OP']):
+# Stats compared by default to find similar players
+SIMILARITY_STATS = ['Age', 'Salary', 'Hdrs W/90', 'K Hdrs/90', 'Aer A/90', 'NP-xG/90', 'ShT/90', 'Conv %', 'xG-OP']
+
+
+def similarity_calculation(df_scout,df_squad, player_name, stats=SIMILARITY_STATS, player_id=None, top_k=None, index=None,
+                           spec=None):
     """
     Calculate similarity scores for a given player based on selected attributes.
     
     Parameters:
     df_scout (DataFrame): DataFrame containing scouted players statistics.
     df_squad (DataFrame): DataFrame containing squad player statistics.
-    player_name (str): Name of the player to compare against.
+    player_name (str): Name of the player to compare against (the first one if several share it).
     stats (list): List of attributes to use for similarity calculation.
+    player_id (int): Player ID of the player to compare against, used instead of player_name if set.
+    top_k (int): Number of most similar players returned, every scouted player if None.
+    index: A prebuilt index of df_scout on the stats to search, e.g. an approximate
+        ivf_index.IVFIndex for pools of millions of players. The exact similarity
+        index of df_scout if None.
+    spec (dict): A filter spec (see player_filters.filter_spec), e.g. an age or salary range.
+        Only the scouted players it selects are compared, they are selected before
+        any similarity is computed.
     
     Returns:
-    DataFrame: DataFrame with similarity scores for each player.
+    DataFrame: DataFrame with the player ID, name and cosine similarity of the scouted players,
+    most similar first.
     """
-    # Select relevant columns for similarity calculation
-    
-    
-    # Extract the player's data
-    player_data = df_squad[df_squad['Name'] == player_name][stats].values
-    
-    # Calculate similarity scores using cosine similarity
-    similarity_scores = cosine_similarity(df_scout[stats], player_data)
-    
-    # Create a DataFrame with similarity scores
-    similarity_df = pd.DataFrame(similarity_scores, index=df_scout['Name'], columns=['Similarity'])
-    similarity_df.reset_index(inplace=True)
-    
-    return similarity_df.sort_values(by='Similarity', ascending=False)
+    # Stats left out of a projected load are cleaned here
+    df_squad = with_columns(df_squad, stats)
 
+    # Extract the player's data with an index lookup
+    player_data = player_row(df_squad, player_name, player_id)[stats].to_numpy(dtype=float)
+    
+    # Constraints are resolved to candidate rows through the filter index of the dataset
+    rows = None if spec is None else filter_rows(df_scout, spec)
 
-# Define the inverse stas list
-inverse_stats = [
-    'Dist/90', 'Poss Lost/90', 'Tcon/90', 'Mins/Gl', 'Last Gl', 'Off', 'FA', 
-    'Fls', 'Yel', 'Red', 'Conc', 'All/90', 'Last C']
+    if index is None:
+        # Scouted players are normalized once per (dataset, stats) by the similarity index
+        return similarity_index(df_scout, stats).similar(player_data, top_k, rows)
 
-#Define scaler
-scaler = MinMaxScaler(feature_range=(0,100))
+    if list(index.stats) != list(stats):
+        raise ValueError(f"The index compares {index.stats}, not {list(stats)}.")
+    similar = index.similar(player_data, top_k, ids=None if rows is None else df_scout.index[rows].to_numpy())
+    rows = df_scout.index.get_indexer(similar[PLAYER_ID])
+    similar.insert(1, 'Name', df_scout['Name'].to_numpy()[rows])
+    return similar
 
 
-def evaluate_players_by_position(df, stat_weights):
+def replacement_matrix(df_scout, df_squad, stats=SIMILARITY_STATS, top_k=5, same_position=False, spec=None):
     """
-    Filters and evaluates players by position using stat_weights and optional inverse stats.
+    Most similar scouted players to every squad player, in one batched pass.
 
-    Inputs:
-        df: the filtered pd.DataFrame
-        stat_weights: a dict with the stats and their correnspoding weight 
+    Parameters:
+        df_scout (DataFrame): Scouted players.
+        df_squad (DataFrame): Squad players.
+        stats (list): Stats compared, as for similarity_calculation.
+        top_k (int): Number of candidates of every squad player.
+        same_position (bool): If True, only scouted players sharing a position with the
+            squad player are candidates.
+        spec (dict): A filter spec, only the scouted players it selects are candidates.
 
     Returns:
-        pd.DataFrame: Players in that position sorted by Rating.
+        DataFrame: top_k rows per squad player, in squad order: the squad player's ID and name,
+        the rank, player ID, name and position of the candidate and their similarity.
     """
-    
+    # Stats left out of a projected load are cleaned here
+    df_squad = with_columns(df_squad, stats)
+    index = similarity_index(df_scout, stats)
 
-    # Validate weights <- Maybe this check is not useless, already checked
+    masks = {}
+    if same_position:
+        masks = {'row_masks': position_masks(df_scout['Position']), 'query_masks': position_masks(df_squad['Position'])}
+    rows = None if spec is None else filter_rows(df_scout, spec)
+    rows, scores = index.query_many(df_squad[stats].to_numpy(dtype=float), top_k, rows=rows, **masks)
+
+    squad_rows, ranks = np.nonzero(rows >= 0)
+    rows, scores = rows[squad_rows, ranks], scores[squad_rows, ranks]
+    candidates = df_scout.iloc[rows]
+    return with_readable_positions(pd.DataFrame({
+        'Squad ID': df_squad.index[squad_rows],
+        'Squad Player': df_squad['Name'].to_numpy()[squad_rows],
+        'Rank': ranks + 1,
+        PLAYER_ID: candidates.index,
+        'Name': candidates['Name'].to_numpy(),
+        'Position': candidates['Position'].to_numpy(),
+        'Similarity': scores,
+    }))
+
+
+# Define the inverse stas list
+inverse_stats = [
+    'Dist/90', 'Poss Lost/90', 'Tcon/90', 'Mins/Gl', 'Last Gl', 'Off', 'FA', 
+    'Fls', 'Yel', 'Red', 'Conc', 'All/90', 'Last C']
+
+def validate_weights(df, stat_weights):
+    """
+    Checks that every weighted stat is a numeric column of df with a positive weight.
+
+    Raises:
+        ValueError: If a weight is not positive or a stat is missing.
+        TypeError: If a stat is not numeric.
+    """
     for stat, weight in stat_weights.items():
         if weight <= 0:
             raise ValueError(f"Weight for stat '{stat}' must be > 0.")
@@ -63,29 +119,217 @@ def evaluate_players_by_position(df, stat_weights):
         if not pd.api.types.is_numeric_dtype(df[stat]):
             raise TypeError(f"Stat '{stat}' must be numeric.")
 
-    # Filter by position in set
-    df_eval = df.copy()
 
-    if df_eval.empty:
-        return pd.DataFrame()  # No players found
+def scale_ratings(raw_ratings):
+    """
+    Min-max scales raw ratings to 0-100 per column, as MinMaxScaler(feature_range=(0, 100))
+    does, rounded to 2 decimals.
 
-    # Create weifhted columns
-    weighted_cols = []
-    for stat, weight in stat_weights.items():
-        weighted_col = stat + "_weighted"
+    Parameters:
+        raw_ratings (np.ndarray): Raw ratings, one column per profile.
+    Returns:
+        np.ndarray: The scaled ratings. A column with a single value is scaled to 0.
+    """
+    low = np.nanmin(raw_ratings, axis=0)
+    data_range = np.nanmax(raw_ratings, axis=0) - low
+    scale = 100 / np.where(data_range == 0, 1, data_range)
+    return (raw_ratings * scale - low * scale).round(2)
+
+
+def evaluate_profiles(df, profiles=POSITION_PROFILES):
+    """
+    Rates every player for many weight profiles at once.
+
+    The stats of all profiles are read once as a players x stats matrix and
+    multiplied by a stats x profiles matrix of weights, with inverse stats
+    weighted negatively and each profile divided by the sum of its weights.
+    Each column is then min-max scaled as in evaluate_players_by_position.
+
+    Parameters:
+        df (pd.DataFrame): The filtered players.
+        profiles (dict): The stat_weights dict of each profile, by profile name.
+    Returns:
+        pd.DataFrame: The rating of each player (rows, same index as df) for each profile (columns).
+    """
+    stats = list(dict.fromkeys(stat for stat_weights in profiles.values() for stat in stat_weights))
+
+    # Stats left out of a projected load are cleaned here
+    df = with_columns(df, stats)
+    for stat_weights in profiles.values():
+        validate_weights(df, stat_weights)
+
+    stat_rows = {stat: row for row, stat in enumerate(stats)}
+    weights = np.zeros((len(stats), len(profiles)))
+    for column, stat_weights in enumerate(profiles.values()):
+        total = sum(stat_weights.values())
+        for stat, weight in stat_weights.items():
+            sign = -1 if stat in inverse_stats else 1
+            weights[stat_rows[stat], column] = sign * weight / total * 100
+
+    if df.empty:
+        return pd.DataFrame(index=df.index, columns=list(profiles), dtype=float)
+
+    raw_ratings = df[stats].to_numpy(dtype=float) @ weights
+    return pd.DataFrame(scale_ratings(raw_ratings), index=df.index, columns=list(profiles))
+
+
+def iter_stat_values(df, stats, normalization='raw', dataset=None):
+    """
+    Yields each stat with its values for the players of df, as floats.
+
+    Parameters:
+        df (pd.DataFrame): The players.
+        stats (list): The stats to read.
+        normalization (str): One of NORMALIZATIONS: the stats as they are, or their
+            percentile ranks or min-max normalized values in the dataset (see stat_percentiles.py).
+        dataset (pd.DataFrame): The dataset the players were selected from (e.g. by a filter),
+            the one the stats are ranked in. df itself if None.
+    """
+    if normalization == 'raw':
+        for stat in stats:
+            # Compact datasets store stats as small ints and float32, weight them as floats
+            yield stat, df[stat].to_numpy(dtype=float)
+        return
+
+    table = stat_table(df if dataset is None else dataset)
+    rows = table.rows_of(df)
+    for stat in stats:
+        yield stat, table.column(stat, normalization)[rows].astype(float)
+
+
+def raw_ratings(df, stat_weights, normalization='raw', dataset=None):
+    """
+    Weighted average of the stats of every player, before scaling.
+
+    The stats are read and accumulated one column at a time, without
+    copying the frame or adding weighted columns to it. See
+    iter_stat_values for normalization and dataset.
+    """
+    raw_rating = np.zeros(len(df))
+    for stat, values in iter_stat_values(df, stat_weights, normalization, dataset):
+        weight = stat_weights[stat]
 
         # Apply inverse logic if the stat is in the inverse_stats list
         if stat in inverse_stats:
-            df_eval[weighted_col] = - df_eval[stat] * weight
+            raw_rating += - values * weight
         else:
-            df_eval[weighted_col] = df_eval[stat] * weight
+            raw_rating += values * weight
 
-        weighted_cols.append(weighted_col)
-    
-    # Compute the rating as a weighted average.
-    raw_rating = df_eval[weighted_cols].sum(axis=1) / sum(stat_weights.values()) * 100
+    return raw_rating / sum(stat_weights.values()) * 100
+
+
+def rating_table(df, rows, ratings, stats):
+    """
+    Output table of an evaluation, built from the ranked rows only.
+    """
+    columns = ['Name', 'Club', 'Age', 'Position'] + list(stats)
+    df_eval = df.iloc[rows, df.columns.get_indexer(columns)]
+    df_eval.insert(4, 'Rating', ratings[rows])
+    return with_readable_positions(df_eval.reset_index(drop=True))
+
+
+def evaluate_players_by_position(df, stat_weights, top_k=None, normalization='raw', dataset=None):
+    """
+    Filters and evaluates players by position using stat_weights and optional inverse stats.
+
+    Inputs:
+        df: the filtered pd.DataFrame
+        stat_weights: a dict with the stats and their correnspoding weight 
+        top_k: if set, only the top_k best players are ranked and returned,
+            as the first top_k rows of the full evaluation
+        normalization: 'raw' to weight the stats as they are, 'percentile' or 'minmax'
+            to weight their percentile ranks or normalized values in dataset
+        dataset: the dataset df was filtered from, df itself if None
+
+    Returns:
+        pd.DataFrame: Players in that position sorted by Rating, ties in dataset order.
+    """
+    # Stats left out of a projected load are cleaned here
+    df = with_columns(df, stat_weights)
+
+    # Validate weights <- Maybe this check is not useless, already checked
+    validate_weights(df, stat_weights)
+
+    if df.empty:
+        return pd.DataFrame()  # No players found
+
+    # Scaled over every player, so the ratings of the top_k don't depend on k
+    ratings = scale_ratings(raw_ratings(df, stat_weights, normalization, dataset))
+
+    return rating_table(df, rank_rows(ratings, top_k), ratings, stat_weights)
 
-    df_eval['Rating'] = scaler.fit_transform(raw_rating.values.reshape(-1,1)).round(2)
 
-    return df_eval[['Name', 'Club', 'Age', 'Position', 'Rating'] + list(stat_weights.keys())]\
-        .sort_values(by='Rating', ascending=False).reset_index(drop=True)
\ No newline at end of file
+def evaluate_position_groups(df, stat_weights, groups=POSITION_GROUPS, normalization='raw', dataset=None):
+    """
+    Ranks the players within each position group, from one rating of every player.
+
+    Players are rated once. Their groups are read from the position masks,
+    and the ratings are min-max scaled and ranked within every group in a
+    single pass, the same as evaluating each group on its own. A player who
+    can play in several groups is listed in each of them by player ID, the
+    rows of the players are not copied.
+
+    Parameters:
+        df (pd.DataFrame): The filtered players.
+        stat_weights (dict): The stats and their weight.
+        groups (dict): The positions of each group, see positions.POSITION_GROUPS.
+        normalization, dataset: See evaluate_players_by_position.
+    Returns:
+        pd.DataFrame: One row per player of each group, sorted by group and rank, with the
+        group, the rank within the group, the player ID and the rating within the group.
+    """
+    # Stats left out of a projected load are cleaned here
+    df = with_columns(df, stat_weights)
+    validate_weights(df, stat_weights)
+
+    if df.empty:  # No players found, and no ratings to take the range of
+        return pd.DataFrame({
+            'Group': pd.Categorical([], categories=list(groups)),
+            'Rank': np.zeros(0, dtype=np.intp),
+            PLAYER_ID: df.index,
+            'Rating': np.zeros(0),
+        })
+
+    raw_rating = raw_ratings(df, stat_weights, normalization, dataset)
+    members = group_membership(df['Position'], groups)
+
+    # Range of the ratings of every group, players without a rating left out
+    rated = members & ~np.isnan(raw_rating)[:, None]
+    low = np.where(rated, raw_rating[:, None], np.inf).min(axis=0)
+    data_range = np.where(rated, raw_rating[:, None], -np.inf).max(axis=0) - low
+    scale = 100 / np.where(rated.any(axis=0) & (data_range > 0), data_range, 1)
+
+    rows, group_codes = np.nonzero(members)
+    ratings = (raw_rating[rows] * scale[group_codes] - low[group_codes] * scale[group_codes]).round(2)
+
+    # By group, then by descending rating with ties in dataset order, as rank_rows
+    keys = -np.where(np.isnan(ratings), -np.inf, ratings)
+    order = np.lexsort((rows, keys, group_codes))
+    rows, group_codes, ratings = rows[order], group_codes[order], ratings[order]
+    starts = np.searchsorted(group_codes, np.arange(len(groups)))
+
+    return pd.DataFrame({
+        'Group': pd.Categorical.from_codes(group_codes, list(groups)),
+        'Rank': np.arange(len(rows)) - starts[group_codes] + 1,
+        PLAYER_ID: df.index[rows],
+        'Rating': ratings,
+    })
+
+
+def position_group_table(df, grouped, group, stat_weights, top_k=None):
+    """
+    Leaderboard of one group of evaluate_position_groups, as returned by
+    evaluate_players_by_position. Only the rows of the group (or of its
+    top_k players) are materialized.
+    """
+    entries = grouped[grouped['Group'] == group]
+    if entries.empty:
+        return pd.DataFrame()  # No players found
+    if top_k is not None:
+        entries = entries.head(top_k)
+
+    df = with_columns(df, stat_weights)
+    rows = df.index.get_indexer(entries[PLAYER_ID])
+    ratings = np.full(len(df), np.nan)
+    ratings[rows] = entries['Rating'].to_numpy()
+    return rating_table(df, rows, ratings, stat_weights)
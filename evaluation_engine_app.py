@@ -1,4 +1,6 @@
 from load_cleaning_data import *
+from dataset_cache import load_cleaning_data_cached
+from parallel_loading import load_many
 from stat_weights import *
 from evaluate_players_by_position import *
 from show_evalution import show_evaluation_table
@@ -19,13 +21,16 @@ stat_weights_dict = None
 
 def handle_load_data():
     global df_cleaned
-    file_path = filedialog.askopenfilename(
+    file_paths = filedialog.askopenfilenames(
         filetypes=[("HTML Files", "*.html")],
-        title="Select HTML file"
+        title="Select HTML file(s)"
     )
-    if file_path:
+    if file_paths:
         try:
-            df_cleaned = load_cleaning_data(file_path)
+            if len(file_paths) > 1:
+                df_cleaned = load_many(list(file_paths), compact=True)
+            else:
+                df_cleaned = load_cleaning_data_cached(file_paths[0], compact=True)
             Messagebox.show_info("Success", "Data cleaned")
         except Exception as e:
             Messagebox.show_error("Error", f"Failed to process file:\n{e}")
@@ -69,16 +74,18 @@ def handle_evaluate():
 # -------------------------
 # Main UI Setup
 # -------------------------
-root = ttk.Window(themename="flatly")  # Choose your theme here
-root.title("Football Analytics Tool")
-root.geometry("400x300")
+# Worker processes of load_many import this module, only open the window when run as a script
+if __name__ == "__main__":
+    root = ttk.Window(themename="flatly")  # Choose your theme here
+    root.title("Football Analytics Tool")
+    root.geometry("400x300")
 
-ttk.Label(root, text="Football Analytics Tool", font=("Helvetica", 16)).pack(pady=20)
+    ttk.Label(root, text="Football Analytics Tool", font=("Helvetica", 16)).pack(pady=20)
 
-ttk.Button(root, text="1. Load & Clean Data", command=handle_load_data, width=30, bootstyle="primary").pack(pady=5)
-ttk.Button(root, text="2. Set Up Filters", command=handle_filters, width=30, bootstyle="info").pack(pady=5)
-ttk.Button(root, text="3. Select Stats & Weights", command=handle_stats, width=30, bootstyle="warning").pack(pady=5)
-ttk.Button(root, text="4. Evaluate Players", command=handle_evaluate, width=30, bootstyle="success").pack(pady=5)
-ttk.Button(root, text="Exit", command=root.quit, width=30, bootstyle="danger").pack(pady=20)
+    ttk.Button(root, text="1. Load & Clean Data", command=handle_load_data, width=30, bootstyle="primary").pack(pady=5)
+    ttk.Button(root, text="2. Set Up Filters", command=handle_filters, width=30, bootstyle="info").pack(pady=5)
+    ttk.Button(root, text="3. Select Stats & Weights", command=handle_stats, width=30, bootstyle="warning").pack(pady=5)
+    ttk.Button(root, text="4. Evaluate Players", command=handle_evaluate, width=30, bootstyle="success").pack(pady=5)
+    ttk.Button(root, text="Exit", command=root.quit, width=30, bootstyle="danger").pack(pady=20)
 
-root.mainloop()
+    root.mainloop()
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from evaluate_players_by_position import (inverse_stats, validate_weights, iter_stat_values, scale_ratings,
+                                          rank_rows, rating_table)
+from load_cleaning_data import with_columns
+
+
+# Weight changes applied as deltas before the running sum is recomputed
+# from scratch, which bounds the floating point drift of the deltas
+MAX_DELTA_UPDATES = 64
+
+
+class EvaluationSession:
+    """
+    Evaluation of a set of players kept up to date as stat weights change.
+
+    The session keeps the signed values of every weighted stat (negated for
+    inverse stats) and the running weighted sum of the players. Changing a
+    weight, adding or removing a stat updates the sum with that one column,
+    in O(number of players). Ratings are min-max scaled only when they are
+    read, see ratings and result. Stats are weighted as they are or
+    normalized, see evaluate_players_by_position.iter_stat_values.
+    """
+
+    def __init__(self, df, stat_weights=None, normalization='raw', dataset=None):
+        self.df = df
+        self.normalization = normalization
+        self.dataset = dataset
+        self.weights = {}
+        self.values = {}
+        self.total = np.zeros(len(df))
+        self.updates = 0
+        if stat_weights:
+            self.update(stat_weights)
+
+    def _signed_values(self, stat):
+        _, values = next(iter_stat_values(self.df, [stat], self.normalization, self.dataset))
+        return - values if stat in inverse_stats else values
+
+    def _delta(self, stat, weight_change):
+        self.total += self.values[stat] * weight_change
+        self.updates += 1
+        if self.updates >= MAX_DELTA_UPDATES:
+            self.rebuild()
+
+    def set_weight(self, stat, weight):
+        """
+        Sets the weight of a stat, adding the stat if it isn't weighted yet.
+
+        Raises:
+            ValueError: If the weight is not positive or the stat is missing.
+            TypeError: If the stat is not numeric.
+        """
+        # Stats left out of a projected load are cleaned here
+        self.df = with_columns(self.df, [stat])
+        validate_weights(self.df, {stat: weight})
+        if stat not in self.weights:
+            self.values[stat] = self._signed_values(stat)
+            self.weights[stat] = 0
+        change = weight - self.weights[stat]
+        self.weights[stat] = weight
+        if change:
+            self._delta(stat, change)
+
+    def remove_stat(self, stat):
+        """
+        Stops weighting a stat.
+        """
+        weight = self.weights.pop(stat)
+        if self.weights:
+            self._delta(stat, -weight)
+        else:
+            self.total[:] = 0
+        del self.values[stat]
+
+    def update(self, stat_weights):
+        """
+        Applies a whole stat_weights dict, as a delta from the current weights.
+        """
+        for stat in [stat for stat in self.weights if stat not in stat_weights]:
+            self.remove_stat(stat)
+        for stat, weight in stat_weights.items():
+            self.set_weight(stat, weight)
+
+    def rebuild(self):
+        """
+        Recomputes the running sum from the stat values.
+        """
+        self.total = np.zeros(len(self.df))
+        for stat, weight in self.weights.items():
+            self.total += self.values[stat] * weight
+        self.updates = 0
+
+    def raw_ratings(self):
+        """
+        Weighted average of the stats of every player, before scaling.
+        """
+        if not self.weights:
+            return np.zeros(len(self.df))
+        return self.total / sum(self.weights.values()) * 100
+
+    def ratings(self):
+        """
+        Ratings of every player, min-max scaled to 0-100.
+        """
+        if self.df.empty:
+            return np.zeros(0)
+        return scale_ratings(self.raw_ratings())
+
+    def result(self, top_k=None):
+        """
+        Players sorted by Rating, as returned by evaluate_players_by_position.
+        """
+        if self.df.empty:
+            return pd.DataFrame()  # No players found
+        ratings = self.ratings()
+        return rating_table(self.df, rank_rows(ratings, top_k), ratings, self.weights)
@@ -2,12 +2,13 @@ import pandas as pd
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import Listbox, Scrollbar, VERTICAL, MULTIPLE, END, StringVar
+from player_filters import POSITION_GRID, filter_spec, apply_filter
 
 
 class FilterWindow:
     def __init__(self, master, df, callback):
         self.df = df
-        self.filtered_df = df.copy()
+        self.filtered_df = df
         self.callback = callback
 
         self.window = ttk.Toplevel(master)
@@ -50,16 +51,7 @@ class FilterWindow:
         pos_frame.grid(row=7, column=0, sticky=EW, pady=5)
 
         self.position_vars = {}
-        position_grid = [
-            [None, "STC", None],
-            ["AML", "AMC", "AMR"],
-            ["ML",  "MC",  "MR"],
-            ["WDL", "DM",  "WDR"],
-            ["DL",  "DC",  "DR"],
-            [None, "GK", None]
-        ]
-
-        for r, row in enumerate(position_grid):
+        for r, row in enumerate(POSITION_GRID):
             for c, pos in enumerate(row):
                 if pos:
                     var = ttk.BooleanVar()
@@ -94,22 +86,21 @@ class FilterWindow:
         self.age_max_label.set(f"Max Age: {self.age_max.get()}")
 
     def apply_filters(self):
-        df = self.df.copy()
         selected_nat = [self.nat_listbox.get(i) for i in self.nat_listbox.curselection() if self.nat_listbox.get(i) != "All"]
-        if selected_nat:
-            df = df[df["Nat"].isin(selected_nat)]
         selected_div = [self.div_listbox.get(i) for i in self.div_listbox.curselection() if self.div_listbox.get(i) != "All"]
-        if selected_div:
-            df = df[df["Division"].isin(selected_div)]
         selected_pos = [pos for pos, var in self.position_vars.items() if var.get()]
-        if selected_pos:
-            df = df[df["Position"].apply(lambda pos: bool(set(selected_pos) & pos if isinstance(pos, set) else {pos}))]
-
-        
-        df = df[(df["Age"] >= self.age_min.get()) & (df["Age"] <= self.age_max.get())]
-        df = df[(df["Salary"] >= self.salary_min.get()) & (df["Salary"] <= self.salary_max.get())]
-        df = df[df['Apps'] >= self.min_apps_var.get()]
-        self.filtered_df = df.copy()
+
+        # Same filter spec as the Streamlit front end, resolved as one mask
+        self.spec = filter_spec(
+            nationalities=selected_nat or None,
+            divisions=selected_div or None,
+            positions=selected_pos,
+            ranges={
+                "Age": (self.age_min.get(), self.age_max.get()),
+                "Salary": (self.salary_min.get(), self.salary_max.get()),
+                "Apps": (self.min_apps_var.get(), None),
+            })
+        self.filtered_df = apply_filter(self.df, self.spec)
         self.callback(self.filtered_df)
         self.window.destroy()
 
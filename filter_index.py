@@ -0,0 +1,145 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from frame_cache import frame_cache
+from positions import POSITION_BITS, position_masks
+
+
+# Columns filtered by a list of values, and by a range of values
+CATEGORY_FILTERS = ['Nat', 'Division']
+RANGE_FILTERS = ['Age', 'Salary', 'Transfer Value', 'Mins', 'Apps']
+
+
+class InvertedIndex:
+    """
+    Rows of every value of a categorical column, as slices of one array
+    of row positions sorted by value.
+    """
+
+    def __init__(self, column):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes, values = column.cat.codes.to_numpy(), list(column.cat.categories)
+        else:
+            codes, values = pd.factorize(column)
+            values = list(values)
+        self.codes = codes
+        self.values = values
+        self.codes_of = {value: code for code, value in enumerate(values)}
+
+        # Missing values (code -1) are left out
+        self.rows = np.argsort(codes, kind='stable')
+        sorted_codes = codes[self.rows]
+        self.offsets = np.searchsorted(sorted_codes, np.arange(len(values) + 1))
+
+    def rows_of(self, values):
+        """
+        Row positions of the rows holding any of the values.
+        """
+        codes = [self.codes_of[value] for value in values if value in self.codes_of]
+        return np.concatenate([self.rows[self.offsets[code]:self.offsets[code + 1]] for code in codes] or
+                              [np.empty(0, dtype=np.intp)])
+
+    def present_values(self, mask=None):
+        """
+        Values held by at least one row (of the mask), sorted.
+        """
+        codes = self.codes if mask is None else self.codes[mask]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.values))
+        return sorted(self.values[code] for code in np.flatnonzero(counts))
+
+
+class FilterIndex:
+    """
+    Index of a dataset to resolve filters with whole-array operations.
+
+    Positions are matched with their bitmasks, nationalities and divisions
+    through inverted indexes of their category codes, and ranges on the
+    value arrays. Built once per dataset, see filter_index.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.position_masks = position_masks(df['Position'])
+        self.categories = {column: InvertedIndex(df[column]) for column in CATEGORY_FILTERS if column in df}
+        self.values = {column: df[column].to_numpy() for column in RANGE_FILTERS if column in df}
+        self.digest = self._digest()
+
+    def _digest(self):
+        """
+        Hash of everything a filter depends on, so datasets with the same
+        hash give the same filter results.
+        """
+        digest = hashlib.sha256(np.ascontiguousarray(self.position_masks).tobytes())
+        for column, index in self.categories.items():
+            digest.update(column.encode())
+            digest.update(repr(index.values).encode())
+            digest.update(np.ascontiguousarray(index.codes).tobytes())
+        for column, values in self.values.items():
+            digest.update(f"{column}|{values.dtype}".encode())
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+
+    def mask(self, positions=None, nationalities=None, divisions=None, ranges=None):
+        """
+        Resolves a filter to a boolean array of the selected rows.
+
+        Parameters:
+            positions (list): Keep players who can play any of these positions, all players if empty.
+            nationalities (list): Keep players of these nationalities.
+            divisions (list): Keep players of these divisions.
+            ranges (dict): Keep players whose value of a column of RANGE_FILTERS is
+                within (min, max), both included. None leaves a side open.
+            Filters left to None select every player.
+        Returns:
+            np.ndarray: Boolean array with one entry per player of the dataset.
+        """
+        mask = np.ones(self.n_rows, dtype=bool)
+
+        if positions:
+            selected = 0
+            for position in positions:
+                selected |= POSITION_BITS.get(position, 0)
+            mask &= (self.position_masks & selected) != 0
+
+        for column, values in (('Nat', nationalities), ('Division', divisions)):
+            if values is not None:
+                in_values = np.zeros(self.n_rows, dtype=bool)
+                in_values[self.categories[column].rows_of(values)] = True
+                mask &= in_values
+
+        for column, (low, high) in (ranges or {}).items():
+            values = self.values[column]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+
+        return mask
+
+    def present_values(self, column, mask=None):
+        """
+        Sorted values of a column of CATEGORY_FILTERS held by the rows of the mask.
+        """
+        return self.categories[column].present_values(mask)
+
+    def value_range(self, column, mask=None):
+        """
+        (min, max) of a column of RANGE_FILTERS over the rows of the mask, None if no row is selected.
+        """
+        values = self.values[column] if mask is None else self.values[column][mask]
+        if not len(values):
+            return None
+        return values.min(), values.max()
+
+
+# Indexes of the datasets in use, dropped with their dataset
+_indexes = {}
+
+
+def filter_index(df):
+    """
+    Returns the FilterIndex of a dataset, built on the first call.
+    """
+    return frame_cache(_indexes, df, FilterIndex)
@@ -1,60 +1,61 @@
 import streamlit as st
+from app_cache import filter_dataset
+from filter_index import filter_index
+from player_filters import POSITION_GRID, filter_spec, filter_rows, filter_mask, apply_filter
 
-def filter_data_ui(df):
+def filter_data_ui(df, dataset_key=None):
     st.header("🔍 Filter Player Dataset")
 
+    # Every step adds to a filter spec, the options of the next steps come from
+    # the players it selects so far (memoized), the rows are selected once at the end
+    index = filter_index(df)
+    spec = filter_spec()
+
     # Nationality filter
-    nationalities = ["All"] + sorted(df["Nat"].dropna().unique().tolist())
+    nationalities = ["All"] + index.present_values("Nat")
     selected_nat = st.multiselect("Select Nationalities", nationalities, default=["All"])
     if "All" not in selected_nat:
-        df = df[df["Nat"].isin(selected_nat)]
+        spec["nationalities"] = selected_nat
 
     # Division filter
-    divisions = ["All"] + sorted(df["Division"].dropna().unique().tolist())
+    divisions = ["All"] + index.present_values("Division", filter_mask(df, spec))
     selected_div = st.multiselect("Select Divisions", divisions, default=["All"])
     if "All" not in selected_div:
-        df = df[df["Division"].isin(selected_div)]
+        spec["divisions"] = selected_div
 
     # Position filter
     st.subheader("⭕ Select Positions")
-    position_grid = [
-        [None, "STC", None],
-        ["AML", "AMC", "AMR"],
-        ["ML",  "MC",  "MR"],
-        ["WDL", "DM",  "WDR"],
-        ["DL",  "DC",  "DR"],
-        [None, "GK", None]
-    ]
     selected_positions = []
-    for row in position_grid:
+    for row in POSITION_GRID:
         cols = st.columns(len(row))
         for i, pos in enumerate(row):
             if pos:
                 if cols[i].checkbox(pos):
                     selected_positions.append(pos)
 
-    if selected_positions:
-        df = df[df["Position"].apply(lambda pos: bool(set(selected_positions) & pos if isinstance(pos, set) else {pos}))]
+    spec["positions"] = selected_positions
 
     # Age range
     st.subheader("🎂 Age Range")
     age_min, age_max = st.slider("Select Age Range", 14, 55, (14, 55))
-    df = df[(df["Age"] >= age_min) & (df["Age"] <= age_max)]
+    spec["ranges"]["Age"] = (age_min, age_max)
 
     # Salary range
     st.subheader("💰 Salary Range")
-    salary_min = int(df["Salary"].min())
-    salary_max = int(df["Salary"].max())
+    salary_min, salary_max = map(int, index.value_range("Salary", filter_mask(df, spec)) or index.value_range("Salary"))
     salary_range = st.slider("Select Salary Range", salary_min, salary_max, (salary_min, salary_max))
-    df = df[(df["Salary"] >= salary_range[0]) & (df["Salary"] <= salary_range[1])]
+    spec["ranges"]["Salary"] = salary_range
 
     # Minimum Minutes Played
-    st.subheader(f"📊 Minimum Minutes Played. Avg Minutes Played {round(df['Mins'].mean(),0)}")
+    st.subheader(f"📊 Minimum Minutes Played. Avg Minutes Played {round(index.values['Mins'][filter_rows(df, spec)].mean(),0)}")
     min_apps = st.number_input("Minimum Apps", min_value=0, value=90, step=30)
-    df = df[df["Mins"] >= min_apps]
+    spec["ranges"]["Mins"] = (min_apps, None)
+
+    st.session_state.filter_spec = spec
+    # With the key of the dataset, the filtered frame is cached across reruns
+    df = apply_filter(df, spec) if dataset_key is None else filter_dataset(df, dataset_key, spec)
 
-    # Display filtered data
+    # The filtered data is displayed by the caller
     st.success(f"Filtered dataset contains {len(df)} players.")
-    st.dataframe(df)
 
     return df
\ No newline at end of file
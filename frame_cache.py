@@ -0,0 +1,27 @@
+import weakref
+
+
+def frame_cache(store, df, build):
+    """
+    Returns the object cached for a frame in store, built with build(df) on
+    the first call.
+
+    Entries are keyed by the identity of the frame and dropped with it, so
+    state derived from a dataset (indexes, sort orders) is built once and
+    never outlives its dataset.
+
+    Parameters:
+        store (dict): The cache, a module-level dictionary of the caller.
+        df (pd.DataFrame): The frame the object is derived from.
+        build (callable): Builds the object of a frame.
+    """
+    key = id(df)
+    entry = store.get(key)
+    if entry is None or entry[0]() is not df:
+        def drop(ref):
+            # A newer frame may have been cached under the same id
+            if store.get(key, (None,))[0] is ref:
+                del store[key]
+
+        entry = store[key] = (weakref.ref(df, drop), build(df))
+    return entry[1]
@@ -0,0 +1,326 @@
+import codecs
+import html
+import os
+import re
+
+from pandas.io.parsers import TextParser
+
+
+# Same whitespace handling as pd.read_html
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+# A start or end tag, or a comment / doctype declaration
+_RE_TOKEN = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)([^>]*)>|<!--.*?-->|<![^>]*>", re.S)
+_RE_SPAN = re.compile(r"""\b(?:col|row)span\s*=\s*["']?(?!1\b)[^\s"'>]""", re.I)
+
+# A whole row of plain <td>/<th> cells, the layout of every row of the FM views
+_RE_ROW = re.compile(r"\s*<tr\b[^>]*>((?:\s*<t[dh]>[^<]*</t[dh]>)*)\s*</tr>", re.I)
+_RE_CELL = re.compile(r"<t[dh]>([^<]*)</t[dh]>", re.I)
+_RE_CELL_TAG = re.compile(r"<(t[dh])>", re.I)
+_RE_DOUBLE_SPACE = re.compile(r"\s\s")
+
+
+def remove_whitespace(text):
+    """
+    Strips a cell text and replaces extra whitespace inside it with a single space.
+    """
+    return _RE_WHITESPACE.sub(" ", text.strip())
+
+
+class FMTableParser:
+    """
+    Streaming parser for the player table of a Football Manager HTML export.
+
+    The document is fed in chunks and tokenized with a single regular
+    expression. Rows are collected as soon as they are closed, so only the
+    text of the current row is kept while parsing and no DOM is ever built.
+    Only the first table of the document is read.
+    """
+
+    def __init__(self):
+        self.header = []
+        self.rows = []
+        self.footer = []
+        self.done = False
+        self._buffer = ''
+        self._in_table = False
+        self._section = None
+        self._has_thead = False
+        self._body_started = False
+        self._row = None
+        self._row_tags = None
+        self._cell = None
+
+    def feed(self, data):
+        """
+        Parses the next chunk of the document. An incomplete tag or comment
+        at the end of the chunk is kept until the next one.
+        """
+        data = self._buffer + data
+        self._buffer = ''
+        for opening, closing in (('<!--', '-->'), ('<', '>')):
+            end = data.rfind(opening)
+            if end != -1 and data.find(closing, end) == -1:
+                self._buffer = data[end:]
+                data = data[:end]
+                break
+        self._parse(data)
+
+    def close(self):
+        self._parse(self._buffer)
+        self._buffer = ''
+        self._end_row()
+
+    def _parse(self, data):
+        pos = 0
+        while not self.done:
+            if self._in_table and self._row is None:
+                # Fast path: read a plain row in one match
+                match = _RE_ROW.match(data, pos)
+                if match:
+                    row = match.group(1)
+                    if '&' in row or '\n' in row or '\r' in row or _RE_DOUBLE_SPACE.search(row):
+                        self._row = [remove_whitespace(html.unescape(text)) for text in _RE_CELL.findall(row)]
+                    else:
+                        self._row = [text.strip() for text in _RE_CELL.findall(row)]
+                    self._row_tags = _RE_CELL_TAG.findall(row) if not self._body_started else []
+                    self._end_row()
+                    pos = match.end()
+                    continue
+
+            match = _RE_TOKEN.search(data, pos)
+            if match is None:
+                break
+            if self._cell is not None and match.start() > pos:
+                self._cell.append(data[pos:match.start()])
+            pos = match.end()
+
+            closing, tag, attrs = match.groups()
+            if tag is None:
+                continue  # Comment or doctype
+            tag = tag.lower()
+            if closing:
+                self._end_tag(tag)
+            else:
+                self._start_tag(tag, attrs)
+
+        if not self.done and self._cell is not None and pos < len(data):
+            self._cell.append(data[pos:])
+
+    def _start_tag(self, tag, attrs):
+        if tag == 'table':
+            if self._in_table:
+                raise ValueError("Nested tables are not supported")
+            self._in_table = True
+        elif not self._in_table:
+            return
+        elif tag in ('thead', 'tbody', 'tfoot'):
+            self._end_row()
+            self._section = tag
+        elif tag == 'tr':
+            self._end_row()
+            self._row, self._row_tags = [], []
+        elif tag in ('td', 'th'):
+            self._end_cell()
+            if self._row is None:
+                self._row, self._row_tags = [], []
+            if _RE_SPAN.search(attrs):
+                raise ValueError("Cells spanning several rows or columns are not supported")
+            self._cell = []
+            self._row_tags.append(tag)
+        elif tag == 'br' and self._cell is not None:
+            # Line breaks separate words, as in the text pd.read_html gives
+            self._cell.append(' ')
+
+    def _end_tag(self, tag):
+        if not self._in_table:
+            return
+        if tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+        elif tag in ('thead', 'tbody', 'tfoot'):
+            self._end_row()
+            self._section = None
+        elif tag == 'table':
+            self._end_row()
+            self.done = True
+
+    def _end_cell(self):
+        if self._cell is not None:
+            text = ''.join(self._cell)
+            if '&' in text:
+                text = html.unescape(text)
+            self._row.append(remove_whitespace(text))
+            self._cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row is None:
+            return
+        row, tags = self._row, self._row_tags
+        self._row = self._row_tags = None
+
+        if self._section == 'thead':
+            self._has_thead = True
+            self.header.append(row)
+        elif self._section == 'tfoot':
+            self.footer.append(row)
+        elif not self._has_thead and not self._body_started and all(tag.lower() == 'th' for tag in tags):
+            # Without <thead>, the top <th>-only rows are the header
+            self.header.append(row)
+        else:
+            self._body_started = True
+            self.rows.append(row)
+
+    def to_frame(self):
+        """
+        Types the collected rows the same way pd.read_html does.
+
+        Returns:
+            pd.DataFrame: The player table with inferred column types.
+        """
+        if not self.header and not self.rows:
+            raise ValueError("No tables found")
+
+        header = None
+        if self.header:
+            if len(self.header) == 1:
+                header = 0
+            else:
+                header = [i for i, row in enumerate(self.header) if any(text for text in row)]
+
+        return _rows_to_frame(self.header + self.rows + self.footer, header)
+
+    def pop_frame(self, n_rows):
+        """
+        Removes the first n_rows collected rows and types them as a frame
+        with the table header. Used to read the table in batches.
+        """
+        if len(self.header) != 1:
+            raise ValueError("Reading in batches needs a table with a single header row")
+
+        rows = self.rows[:n_rows]
+        del self.rows[:n_rows]
+        return _rows_to_frame(self.header + rows, header=0)
+
+
+def _rows_to_frame(body, header):
+    # Fill out ragged rows
+    width = max(len(row) for row in body)
+    for row in body:
+        if len(row) < width:
+            row += [''] * (width - len(row))
+
+    with TextParser(body, header=header, skiprows=0, thousands=',') as tp:
+        return tp.read()
+
+
+def _iter_chunks(data_path, chunk_size):
+    """
+    Yields the text of an export in chunks, from a path or a file-like object.
+    """
+    if hasattr(data_path, 'read'):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        while True:
+            chunk = data_path.read(chunk_size)
+            if not chunk:
+                break
+            yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield decoder.decode(b'', final=True)
+    elif isinstance(data_path, (str, os.PathLike)) and os.path.isfile(data_path):
+        with open(data_path, encoding='utf-8') as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    else:
+        raise ValueError(f"Cannot stream '{data_path}', expected a file path or a file object.")
+
+
+def read_fm_table(data_path, chunk_size=1 << 16):
+    """
+    Reads the player table of a Football Manager HTML export.
+
+    This is a fast replacement of pd.read_html for the fixed table layout of
+    the Scout and Squad views. The file is read incrementally and parsing
+    stops at the end of the first table.
+
+    Parameters:
+        data_path (str or file-like): Path or file object of the HTML export.
+        chunk_size (int): Number of characters fed to the parser at a time.
+    Returns:
+        pd.DataFrame: The player table, typed the same way as pd.read_html.
+    Raises:
+        ValueError: If the file has a layout the parser does not handle.
+    """
+    parser = FMTableParser()
+    for chunk in _iter_chunks(data_path, chunk_size):
+        parser.feed(chunk)
+        if parser.done:
+            break
+    parser.close()
+    return parser.to_frame()
+
+
+def iter_fm_table(data_path, chunk_rows=10_000, chunk_size=1 << 16):
+    """
+    Reads the player table of a Football Manager HTML export in batches.
+
+    Parameters:
+        data_path (str or file-like): Path or file object of the HTML export.
+        chunk_rows (int): Number of players in each batch.
+        chunk_size (int): Number of characters fed to the parser at a time.
+    Yields:
+        pd.DataFrame: Consecutive batches of the player table, each typed
+        the same way as pd.read_html.
+    Raises:
+        ValueError: If the file has a layout the parser does not handle.
+    """
+    parser = FMTableParser()
+    for chunk in _iter_chunks(data_path, chunk_size):
+        parser.feed(chunk)
+        while len(parser.rows) >= chunk_rows:
+            yield parser.pop_frame(chunk_rows)
+        if parser.done:
+            break
+    parser.close()
+
+    parser.rows += parser.footer
+    parser.footer = []
+    if not parser.header and not parser.rows:
+        raise ValueError("No tables found")
+    while parser.rows:
+        yield parser.pop_frame(chunk_rows)
+
+
+def count_fm_rows(data_path, chunk_size=1 << 20):
+    """
+    Returns an upper bound of the number of rows of an export, the number
+    of '<tr' tags in the file. File-like objects are rewound afterwards.
+    """
+    if hasattr(data_path, 'read'):
+        file = data_path
+    elif isinstance(data_path, (str, os.PathLike)) and os.path.isfile(data_path):
+        file = open(data_path, 'rb')
+    else:
+        raise ValueError(f"Cannot stream '{data_path}', expected a file path or a file object.")
+
+    count = 0
+    tail = b''
+    try:
+        # Text files return '' at the end, binary files b''
+        while chunk := file.read(chunk_size):
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            # The last two bytes of the previous chunk catch tags split between chunks
+            data = tail + chunk.lower()
+            count += data.count(b'<tr')
+            tail = data[-2:]
+    finally:
+        if file is data_path:
+            file.seek(0)
+        else:
+            file.close()
+    return count
@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from load_cleaning_data import with_columns
+from player_index import PLAYER_ID
+from similarity_index import MAX_BLOCK_CELLS
+from table_sorting import rank_rows
+
+
+# Lists of players probed by a query by default, more for a better recall and slower queries
+DEFAULT_N_PROBE = 8
+# Players sampled per list to train the centroids, and training iterations
+TRAIN_ROWS_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+# Arrays of a saved index, one .npy file each
+INDEX_ARRAYS = ['centroids', 'offsets', 'ids', 'vectors']
+
+
+def _unit_rows(values):
+    # Same normalization as sklearn's cosine_similarity, rows of zeros stay zeros
+    norms = np.sqrt(np.einsum('ij,ij->i', values, values))
+    return values / np.where(norms == 0, 1, norms)[:, None]
+
+
+def _nearest_lists(vectors, centroids):
+    """
+    Closest centroid of every vector, computed by blocks of at most MAX_BLOCK_CELLS similarities.
+    """
+    block_rows = max(1, MAX_BLOCK_CELLS // len(centroids))
+    lists = np.empty(len(vectors), dtype=np.intp)
+    for start in range(0, len(vectors), block_rows):
+        lists[start:start + block_rows] = np.argmax(vectors[start:start + block_rows] @ centroids.T, axis=1)
+    return lists
+
+
+class IVFIndex:
+    """
+    Approximate cosine similarity search for pools of millions of players.
+
+    An inverted file index: the unit-length stat vectors of the players are
+    grouped in n_lists lists around centroids, trained by spherical k-means
+    on a sample of the players, and stored as float32 sorted by list. A query
+    scores the centroids, then only the players of its n_probe closest lists.
+    Probing more lists gives a better recall for a slower query, probing all
+    of them is an exact search. See benchmark_similarity.py for the recall
+    of a pool.
+
+    Saved as a directory of .npy files that load memory-mapped, so opening
+    an index reads nothing until it is queried.
+    """
+
+    def __init__(self, stats, centroids, offsets, ids, vectors, n_probe=DEFAULT_N_PROBE):
+        self.stats = list(stats)
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.vectors = vectors
+        self.n_probe = n_probe
+
+    @classmethod
+    def build(cls, df, stats, n_lists=None, n_probe=DEFAULT_N_PROBE, seed=0):
+        """
+        Builds the index of a dataset on a list of stats.
+
+        Parameters:
+            df (pd.DataFrame): The pool of players, e.g. several exports loaded with load_many.
+            stats (list): The stats compared.
+            n_lists (int): Number of lists, the square root of the number of players if None.
+            n_probe (int): Lists probed by a query by default.
+            seed (int): Seed of the sample and of the initial centroids.
+        """
+        # Stats left out of a projected load are cleaned here
+        values = with_columns(df, stats)[list(stats)].to_numpy(dtype=np.float64)
+        vectors = _unit_rows(values).astype(np.float32)
+        n_lists = min(n_lists or max(1, int(np.sqrt(len(vectors)))), max(len(vectors), 1))
+
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), n_lists * TRAIN_ROWS_PER_LIST), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            lists = _nearest_lists(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, lists, sample)
+            # Lists left without players keep their centroid
+            empty = np.bincount(lists, minlength=n_lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = _unit_rows(sums).astype(np.float32)
+
+        lists = _nearest_lists(vectors, centroids)
+        order = np.argsort(lists, kind='stable')
+        offsets = np.searchsorted(lists[order], np.arange(n_lists + 1))
+        return cls(stats, centroids, offsets, df.index.to_numpy()[order], vectors[order], n_probe)
+
+    def query(self, vector, top_k=None, n_probe=None, ids=None):
+        """
+        Most similar players to a vector of the stats, among the players of the closest lists.
+
+        Parameters:
+            vector (array-like): Values of the stats, in the order of the index.
+            top_k (int): Number of players returned, every player probed if None.
+            n_probe (int): Lists probed, the n_probe of the index if None.
+            ids (np.ndarray): If set, the player IDs of the only players searched.
+                The others are left out of the probed lists before any similarity is
+                computed, and more lists are probed until top_k players are found.
+        Returns:
+            tuple: Player IDs of the players, most similar first, and their similarity.
+        """
+        vector = _unit_rows(np.asarray(vector, dtype=np.float64).reshape(1, -1))[0].astype(np.float32)
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+
+        # Every list is a contiguous range of rows, read as a slice of the (memory-mapped) arrays
+        probed = {}
+        n_found = 0
+        for i in rank_rows(self.centroids @ vector):
+            # With ids, lists are probed until top_k of the players searched are found
+            if len(probed) >= n_probe and (ids is None or top_k is None or n_found >= top_k):
+                break
+            start, end = self.offsets[i], self.offsets[i + 1]
+            candidates, vectors = self.ids[start:end], self.vectors[start:end]
+            if ids is not None:
+                allowed = np.isin(candidates, ids)
+                candidates, vectors = candidates[allowed], vectors[allowed]
+            probed[i] = candidates, vectors
+            n_found += len(candidates)
+
+        candidates = np.concatenate([probed[i][0] for i in sorted(probed)])
+        vectors = np.concatenate([probed[i][1] for i in sorted(probed)])
+        scores = (vectors @ vector).astype(np.float64)
+        best = rank_rows(scores, top_k)
+        return candidates[best], scores[best]
+
+    def similar(self, vector, top_k=None, n_probe=None, ids=None):
+        """
+        Most similar players to a vector of the stats, by player ID.
+        """
+        ids, scores = self.query(vector, top_k, n_probe, ids)
+        return pd.DataFrame({PLAYER_ID: ids, 'Similarity': scores})
+
+    def save(self, path):
+        """
+        Writes the index to a directory, see load.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(path, 'index.json'), 'w', encoding='utf-8') as file:
+            json.dump({'stats': self.stats, 'n_probe': self.n_probe, 'players': len(self.ids)}, file)
+
+    @classmethod
+    def load(cls, path, n_probe=None):
+        """
+        Opens an index written by save, with its arrays memory-mapped.
+        """
+        with open(os.path.join(path, 'index.json'), encoding='utf-8') as file:
+            meta = json.load(file)
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in INDEX_ARRAYS]
+        return cls(meta['stats'], *arrays, n_probe=n_probe or meta['n_probe'])
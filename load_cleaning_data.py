@@ -1,6 +1,38 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import percentileofscore
+import re
+from scipy.stats import rankdata
+from html_table_parser import read_fm_table, iter_fm_table, count_fm_rows
+from positions import POSITION_PROFILES, PROFILE_NAMES, decode_position, decode_positions, position_masks
+from player_index import PLAYER_ID
+
+
+# Bump when a change to the cleaning logic changes the cleaned datasets,
+# this invalidates the datasets stored by dataset_cache
+CLEANING_VERSION = 6
+
+NAME_COLUMNS = ['Name','Style','Nat','Personality', 'Club','Division']
+
+STAT_COLUMNS = ['Name','Position','Age','Height','Weight','Preferred Foot','Expires','Salary','Transfer Value','Apps','Mins','Mins/Gm','Av Rat','PoM','Distance',
+    'Dist/90','Poss Won/90','Poss Lost/90','Gwin','Pts/Gm','Tgls/90','Tcon/90','Gls','Gls/90','Conv %','Mins/Gl','Last Gl','xG','xG/90','xG-OP','NP-xG',
+    'NP-xG/90','Shots','Shot/90','xG/shot','ShT','ShT/90','Shot %','Shots Outside Box/90','Goals Outside Box','Pens','Pens S','Pen/R','Ast','Asts/90','xA',
+    'xA/90','Pas A','Ps A/90','Ps C','Ps C/90','Pas %','Pr Passes','Pr passes/90','K Pas','K Ps/90','OP-KP','OP-KP/90','CCC','Ch C/90','Cr A','Crs A/90',
+    'Cr C','Cr C/90','Cr C/A','OP-Crs A','OP-Crs A/90','OP-Crs C','OP-Crs C/90','OP-Cr %','Drb','Drb/90','FA','Off','Sprints/90','Tck A','Tck/90','Tck C',
+    'Tck R','K Tck','K Tck/90','Itc','Int/90','Blk','Blk/90','Shts Blckd','Shts Blckd/90','Clear','Clr/90','Fls','Yel','Red','Gl Mst','Hdrs A','Aer A/90',
+    'Hdrs','Hdrs W/90','Hdrs L/90','Hdr %','K Hdrs/90','Pres A','Pres A/90','Pres C','Pres C/90','Shutouts','Cln/90','Conc','All/90','Last C','xGP','xGP/90',
+    'Svh','Svp','Svt','Saves/90','Sv %','xSv %','Pens Faced','Pens Saved','Pens Saved Ratio']
+
+# Stat columns always loaded by a projected load (see load_cleaning_data's
+# columns), as the filters and the UIs need them
+BASE_STAT_COLUMNS = ['Name','Position','Age','Height','Weight','Preferred Foot','Expires','Salary','Transfer Value','Apps','Mins']
+
+# Stats of the recommended profiles of the position guide (see positions.POSITION_PROFILES),
+# by short name, usable as columns of a projected load
+STAT_PROFILES = {name: list(POSITION_PROFILES[profile]) for name, profile in PROFILE_NAMES.items()}
+
+# Columns that are not parsed as numbers or are kept as loaded
+TEXT_COLUMNS = ['Name', 'Position', 'Preferred Foot', 'Expires']
+RAW_COLUMNS = ['Age']
 
 
 def add_parenthesis_number(value):
@@ -26,37 +58,9 @@ def convert_positions_to_list(position):
     Handles:
     - Positions with multiple roles (e.g. 'D/WB/M')
     - Optional side info in parentheses (e.g. '(RL)')
+    Each distinct string is only parsed once, see positions.decode_position.
     """
-    position_list = [pos.strip() for pos in position.split(',')]
-
-    role_list = []
-
-    if not isinstance(position_list, list):
-        return role_list
-
-    for position in position_list:
-        if not isinstance(position, str):
-            continue  # Skip non-strings
-
-        position = position.strip()
-
-        if "(" in position and ")" in position:
-            try:
-                role_part, side_part = position.split(" (")
-                roles = [r.strip() for r in role_part.split("/")]
-                sides = side_part.strip(")").strip()
-
-                for role in roles:
-                    for s in sides:
-                        role_list.append(f"{role}{s}")
-            except ValueError:
-                continue  # Skip malformed inputs
-        else:
-            # No side info, just split roles
-            roles = [r.strip() for r in position.split("/")]
-            role_list.extend(roles)
-
-    return set(role_list)
+    return set(decode_position(position)[0])
 
 
 def compute_mean(value):
@@ -80,6 +84,134 @@ def compute_mean(value):
         return np.nan  # Replace other unknowns with NaN
 
 
+def parse_stat_value(value):
+    """
+    Parses a stat cell like '-', '45%', '12.3km' or '0.35' into a float.
+    Missing values ('-') count as 0.
+    """
+    value = value.replace('-','0').replace('%','').replace('cm','').replace('km','')
+    value = float(value)
+    return 0.0 if np.isnan(value) else value
+
+
+def parse_salary(value):
+    """
+    Parses a wage like '£45,000 p/w' into an int. Missing wages count as 0.
+    """
+    value = re.sub(r'\b[pP]/[aAmMwW]\b', '', value)
+    value = re.sub(r'[€$£]', '', value.replace('nan','-').replace(',',''))
+    return 0 if value == '-' else int(value)
+
+
+def parse_transfer_value(value):
+    """
+    Parses a transfer value like '£500K', '£1M - £3M' or 'Not for Sale'.
+    Unknown values are returned as NaN.
+    """
+    value = re.sub(r'[€$£]', '', value).replace('M','000000').replace('K','000')
+    if value == 'Not for Sale':
+        return compute_mean(1_000_000_000)
+    return compute_mean(value)
+
+
+def parse_apps(value):
+    """
+    Parses appearances like '23 (4)' into the total number of appearances.
+    """
+    return add_parenthesis_number(value.replace('-','0'))
+
+
+def parse_height(value):
+    return float(value.replace('m',''))
+
+
+def parse_weight(value):
+    return float(value.replace('kg',''))
+
+
+# Parse rule and result dtype for every column that is not a plain stat
+STAT_PARSE_RULES = {
+    'Apps': (parse_apps, np.int64),
+    'Salary': (parse_salary, np.int64),
+    'Transfer Value': (parse_transfer_value, np.float64),
+    'Height': (parse_height, np.float64),
+    'Weight': (parse_weight, np.float64),
+}
+
+
+def parse_columns(columns, parser, dtype=np.float64):
+    """
+    Applies a parse rule to one or more columns of the same dtype.
+
+    The columns are factorized together so that every distinct value is
+    parsed only once, the results are then mapped back to the rows
+    through the factorized codes.
+
+    Returns:
+        np.ndarray: One row of parsed values per column.
+    """
+    values = np.concatenate([column.to_numpy() for column in columns])
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    if values.dtype == object:
+        # Same as stripping the column: non-string values become NaN
+        uniques = [u.strip() if isinstance(u, str) else np.nan for u in uniques]
+    parsed = np.array([parser(str(u)) for u in uniques], dtype=dtype)
+    return parsed[codes].reshape(len(columns), -1)
+
+
+def clean_stat_columns(df_stats, free_agent_day='30/6/2026'):
+    """
+    Cleans the raw stat columns of an export in a single pass.
+
+    Parameters:
+        df_stats (pd.DataFrame): Raw stat columns as read from the HTML table.
+        free_agent_day (str): Default contract expiration date for missing values (format 'DD/MM/YYYY').
+    Returns:
+        pd.DataFrame: The typed stat columns, in the same order. Unknown
+        transfer values are left as NaN, see fill_unknown_transfer_values.
+    """
+    cleaned = {}
+    stat_groups = {}
+    for column in df_stats.columns:
+        values = df_stats[column]
+        if column in RAW_COLUMNS:
+            cleaned[column] = values
+        elif column in TEXT_COLUMNS:
+            cleaned[column] = values.str.strip() if values.dtype == object else values
+        elif column in STAT_PARSE_RULES:
+            parser, dtype = STAT_PARSE_RULES[column]
+            cleaned[column] = parse_columns([values], parser, dtype)[0]
+        else:
+            # Plain stats sharing a dtype are parsed together
+            stat_groups.setdefault(values.dtype, []).append(column)
+            cleaned[column] = None
+
+    for columns in stat_groups.values():
+        parsed = parse_columns([df_stats[column] for column in columns], parse_stat_value)
+        for column, values in zip(columns, parsed):
+            cleaned[column] = values
+    df_stats = pd.DataFrame(cleaned, index=df_stats.index)
+
+    if 'Preferred Foot' in df_stats:
+        df_stats['Preferred Foot'] = df_stats['Preferred Foot'].astype('category')
+
+    # Standardize Expires contract day
+    if 'Expires' in df_stats:
+        df_stats['Expires'] = df_stats['Expires'].apply(str).str.replace('-',free_agent_day)
+        df_stats['Expires'] = pd.to_datetime(df_stats['Expires'], format='%d/%m/%Y')
+
+    return df_stats
+
+
+# Stats each cumulative statistic is computed from
+CUMULATIVE_STATS = {
+    'Defensive Actions/90': ['Tck/90','K Tck/90','Int/90','Clr/90','Blk/90','K Hdrs/90'],
+    'Attacking Actions/90': ['NP-xG/90','ShT/90','K Hdrs/90'],
+    'Creating Actions/90': ['xA/90','Ch C/90','OP-Crs C/90','Pr passes/90','K Ps/90'],
+    'Goalkeeping Actions/90': ['xGP/90','Saves/90'],
+}
+
+
 def cumulative_statistics(df):
     """
     Computes cumulative statistics for various player actions per 90 minutes.
@@ -93,11 +225,8 @@ def cumulative_statistics(df):
     df['Goalkeeping Actions/90'] = df['xGP/90'] + df['Saves/90']
 
 
-def roles_calculation(df):
-    """
-    Calculates player performance roles based on weighted attributes.
-    """
-    roles = {
+# Weighted attributes of every role
+ROLES = {
     'Assister' : {'Asts/90': 0.3,'xA/90': 0.1,'Ch C/90': 0.1},
     'Reader' : {'Poss Won/90': 0.15,'Poss Lost/90': 0.15,'Int/90': 0.25,'Defensive Actions/90': 0.25},
     'Aerial_Threat' : {'Hdrs W/90': 0.3,'K Hdrs/90': 0.5,'Aer A/90': 0.2,'NP-xG/90': 0.5},
@@ -112,118 +241,554 @@ def roles_calculation(df):
     'Creative_Defender' : {'Asts/90': 0.5,'K Ps/90': 0.5,'Int/90': 0.5,'Pas %': 0.5,'Cr C/90': 0.5},
     'Defensive_Defender' : {'Pas %': 0.5,'Tck/90': 0.5,'K Tck/90': 0.5,'Int/90': 0.5,'Blk/90': 0.5,'Clr/90': 0.5,'Hdrs W/90': 0.5},
     'Goalkeeper' : {'Goalkeeping Actions/90': 0.5,'Svh':0.5,'Svp':0.3,'Svt':0.5}
-    }
-    for role, weights in roles.items():
-        cols = list(weights.keys())
-        vals = list(weights.values())
-    
-        df[role] = df[cols].apply(
-            lambda x: np.dot(x, vals), axis=1)
-    
-        df[role] = df[role].apply(
-            lambda x: round(percentileofscore(df[role], x, kind='rank'), 2))
+}
+
+
+def role_weight_matrix(roles=ROLES):
+    """
+    Builds the weight matrix of the roles.
+
+    Returns:
+        tuple: The stats used by the roles and a stats x roles matrix of their weights.
+    """
+    stats = list(dict.fromkeys(stat for weights in roles.values() for stat in weights))
+    matrix = np.zeros((len(stats), len(roles)))
+    for j, weights in enumerate(roles.values()):
+        for stat, weight in weights.items():
+            matrix[stats.index(stat), j] = weight
+    return stats, matrix
+
+
+ROLE_STATS, ROLE_WEIGHTS = role_weight_matrix()
+
+# Decimals of the role scores compared when ranking them, see role_percentiles
+ROLE_SCORE_DECIMALS = 9
+
+
+def role_scores(df, roles=None):
+    """
+    Computes the weighted score of every role (or of the given roles) with
+    whole-column operations.
+
+    The weighted stats of a role are always summed in ROLE_STATS order, so
+    a role scores exactly the same whichever roles are computed with it
+    (e.g. by a projected load).
+    """
+    roles = list(ROLES) if roles is None else list(roles)
+    columns = [list(ROLES).index(role) for role in roles]
+    used = ROLE_WEIGHTS[:, columns].any(axis=1)
+    stats = [stat for stat, is_used in zip(ROLE_STATS, used) if is_used]
+    weights = ROLE_WEIGHTS[used][:, columns]
+
+    values = df[stats].to_numpy(dtype=np.float64)
+    for j, role in enumerate(roles):
+        score = np.zeros(len(values))
+        for i in np.flatnonzero(weights[:, j]):
+            score += values[:, i] * weights[i, j]
+        df[role] = score
+
+
+def percentile_ranks(values):
+    """
+    Percentile rank of every value among all values, rounded to 2 decimals.
+
+    Same as percentileofscore(values, x, kind='rank') for every x, computed
+    with a single sort: the 'rank' percentile of x is its average rank
+    (ties share the mean of their ranks) over the number of values.
+    """
+    ranks = rankdata(values, method='average')
+    # Twice the average rank is the (left + right + 1) count of percentileofscore
+    return np.round(2 * ranks * (50.0 / max(len(values), 1)), 2)
+
+
+def role_percentiles(df, roles=ROLES):
+    """
+    Replaces the role scores by their percentile rank in the dataset.
+
+    Scores are rounded to ROLE_SCORE_DECIMALS first: summing the weighted
+    stats in another order can change the last bits of a score, which
+    would split players tied on a role.
+    """
+    for role in roles:
+        df[role] = percentile_ranks(np.round(df[role].to_numpy(), ROLE_SCORE_DECIMALS))
+
+
+def roles_calculation(df, roles=None):
+    """
+    Calculates player performance roles based on weighted attributes.
+    """
+    role_scores(df, roles)
+    role_percentiles(df, ROLES if roles is None else roles)
+
+
+def read_player_table(data_path):
+    """
+    Reads the player table of an HTML export.
+
+    Uses the streaming parser of html_table_parser and falls back
+    to pd.read_html for files it cannot handle.
+    """
+    try:
+        return read_fm_table(data_path)
+    except ValueError:
+        return _read_html(data_path)
+
+
+def iter_player_table(data_path, chunk_rows=5_000):
+    """
+    Reads the player table of an HTML export in batches of chunk_rows rows.
+
+    Falls back to slicing the result of pd.read_html for files the
+    streaming parser cannot handle. Nothing is yielded for an export
+    without players. A ValueError of the streaming parser after the first
+    batch is raised, as the batches before it have been used already.
+    """
+    batches = iter_fm_table(data_path, chunk_rows)
+    try:
+        first = next(batches, None)
+    except ValueError:
+        df = _read_html(data_path)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+    if first is None:
+        return
+    yield first
+    yield from batches
+
+
+def _read_html(data_path):
+    if hasattr(data_path, 'seek'):
+        data_path.seek(0)
+    df = pd.read_html(data_path, encoding='utf-8',flavor='html5lib')
+    return df[0]
+
+
+def fill_unknown_transfer_values(values):
+    """
+    Replaces unknown transfer values with the mean of known values.
+    This needs the whole dataset, so it is not part of clean_stat_columns.
+    """
+    avg_value = values.mean()
+    return values.fillna(avg_value).fillna(0).astype(int)
+
+
+def projected_columns(columns):
+    """
+    Resolves the columns of a projected load into the stat columns to clean
+    and the roles to compute.
 
-def load_cleaning_data(data_path,free_agent_day='30/6/2026',squad=False):
+    Parameters:
+        columns (str or list): A profile of STAT_PROFILES, or stats, cumulative statistics and roles.
+    Returns:
+        tuple: The stat columns, in STAT_COLUMNS order, and the roles.
+    Raises:
+        ValueError: If a column is not a known stat, cumulative statistic or role.
+    """
+    if isinstance(columns, str):
+        if columns not in STAT_PROFILES:
+            raise ValueError(f"Unknown stat profile '{columns}'.")
+        columns = STAT_PROFILES[columns]
+
+    unknown = [column for column in columns
+               if column not in STAT_COLUMNS and column not in CUMULATIVE_STATS and column not in ROLES]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}.")
+
+    roles = [column for column in ROLES if column in columns]
+    needed = set(BASE_STAT_COLUMNS) | set(columns)
+    for stats in CUMULATIVE_STATS.values():
+        needed.update(stats)
+    for role in roles:
+        needed.update(ROLES[role])
+    return [column for column in STAT_COLUMNS if column in needed], roles
+
+
+def load_cleaning_data(data_path,free_agent_day='30/6/2026',squad=False,chunk_rows=None,rank_roles=True,compact=False,
+                       columns=None):
     """
     Loads and cleans player data from an HTML source.
     
     This function reads tabular player data from an HTML file, extracts key attributes, 
-    cleans inconsistencies in values, standardizes formats, and merges relevant data frames.
+    cleans inconsistencies in values and standardizes formats. Every player gets a
+    stable player ID, the row of the player in the export, used as the index.
 
     Parameters:
         data_path (str): Path or URL to the HTML file containing player data.
         free_agent_day (str): Default contract expiration date for missing values (format 'DD/MM/YYYY').
         squad (bool): If True, loads squad data; otherwise, loads scouting report data.
+        chunk_rows (int): If set, the data is loaded in batches of chunk_rows players
+            with bounded memory, see load_cleaning_data_chunked.
+        rank_roles (bool): If False, roles are left as raw scores, for datasets that are
+            merged with others and ranked afterwards with role_percentiles.
+        compact (bool): If True, the dataset is returned in the compact layout of compact_dataset.
+        columns (str or list): If set, only these stats, cumulative statistics and roles (or the
+            stats of a profile of STAT_PROFILES) are cleaned, with BASE_STAT_COLUMNS and the stats
+            they depend on. The other columns are cleaned on first access, see LazyStatFrame.
     Returns:
         pd.DataFrame: A cleaned and structured DataFrame containing player attributes and statistics.
     """
+    if chunk_rows:
+        if columns is not None:
+            raise ValueError("A projected load can't be done in batches.")
+        return load_cleaning_data_chunked(data_path, free_agent_day, squad, chunk_rows, rank_roles, compact)
 
-    df = pd.read_html(data_path, encoding='utf-8',flavor='html5lib')
-    df = df[0]
+    stat_columns, roles = STAT_COLUMNS, None
+    if columns is not None:
+        stat_columns, roles = projected_columns(columns)
+
+    df = read_player_table(data_path)
     
     if squad == False:
         df = df.drop(columns=['Inf','Rec'])
     
-    df_names = df[['Name','Style','Nat','Personality', 'Club','Division']]
-    df_stats = df[['Name','Position','Age','Height','Weight','Preferred Foot','Expires','Salary','Transfer Value','Apps','Mins','Mins/Gm','Av Rat','PoM','Distance',
-    'Dist/90','Poss Won/90','Poss Lost/90','Gwin','Pts/Gm','Tgls/90','Tcon/90','Gls','Gls/90','Conv %','Mins/Gl','Last Gl','xG','xG/90','xG-OP','NP-xG',
-    'NP-xG/90','Shots','Shot/90','xG/shot','ShT','ShT/90','Shot %','Shots Outside Box/90','Goals Outside Box','Pens','Pens S','Pen/R','Ast','Asts/90','xA',
-    'xA/90','Pas A','Ps A/90','Ps C','Ps C/90','Pas %','Pr Passes','Pr passes/90','K Pas','K Ps/90','OP-KP','OP-KP/90','CCC','Ch C/90','Cr A','Crs A/90',
-    'Cr C','Cr C/90','Cr C/A','OP-Crs A','OP-Crs A/90','OP-Crs C','OP-Crs C/90','OP-Cr %','Drb','Drb/90','FA','Off','Sprints/90','Tck A','Tck/90','Tck C',
-    'Tck R','K Tck','K Tck/90','Itc','Int/90','Blk','Blk/90','Shts Blckd','Shts Blckd/90','Clear','Clr/90','Fls','Yel','Red','Gl Mst','Hdrs A','Aer A/90',
-    'Hdrs','Hdrs W/90','Hdrs L/90','Hdr %','K Hdrs/90','Pres A','Pres A/90','Pres C','Pres C/90','Shutouts','Cln/90','Conc','All/90','Last C','xGP','xGP/90',
-    'Svh','Svp','Svt','Saves/90','Sv %','xSv %','Pens Faced','Pens Saved','Pens Saved Ratio']]
+    df_names = df[NAME_COLUMNS].copy()
     df_names['Division'] = df_names['Division'].apply(str).str.replace('cinch','Scottish')
     
     # Setting the 'Style', 'Nat', 'Personality', 'Club', 'Division' as categorical type
     for column in ['Style', 'Nat', 'Personality', 'Club', 'Division']:
         df_names[column] = df_names[column].astype('category')
     
-    # Remove leading/trailing whitespace from string-type columns
-    df_stats = df_stats.apply(lambda x: x.str.strip() if x.dtype == "object" else x)
-    
-    # Replace missing values represented by '-' with '0'
-    for column in df_stats.columns:
-        if column not in ['Name','Position', 'Age', 'Height', 'Weight', 'Preferred Foot', 'Expires','Salary', 'Transfer Value']:
-            df_stats[column] = df_stats[column].apply(str).str.replace('-','0')
-    
-    # Clean and convert 'Salary' column
-    df_stats['Salary'] = df_stats['Salary'].apply(str).str.replace(r'\b[pP]/[aAmMwW]\b', '', regex=True)
-    df_stats['Salary'] = df_stats['Salary'].apply(str).str.replace('nan','-')
-    df_stats['Salary'] = df_stats['Salary'].apply(str).str.replace(',','')
-    df_stats['Salary'] = df_stats['Salary'].apply(str).str.replace(r'[€$£]','',regex=True)
-    df_stats['Salary'] = df_stats['Salary'].replace('-', 0).astype(int)
-    
-    # Clean and convert 'Transfer Value' column
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].apply(str).str.replace(r'[€$£]','',regex=True)
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].apply(str).str.replace('M','000000')
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].apply(str).str.replace('K','000')
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].replace('Unknown','np.nan')
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].replace('Not for Sale', 1_000_000_000)
-    # Apply the function to compute means
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].apply(compute_mean)
-
-    # Replace NaN values with the mean of known values
-    avg_value = df_stats['Transfer Value'].mean()
-    df_stats['Transfer Value'].fillna(avg_value, inplace=True)
-    df_stats['Transfer Value'] = df_stats['Transfer Value'].fillna(0).astype(int)
-
-
-    df_stats['Preferred Foot'] = df_stats['Preferred Foot'].astype('category')
-    
-    # Suming all the appears 
-    df_stats['Apps'] = df_stats['Apps'].apply(add_parenthesis_number).astype(int)
-
-    # Further cleaning for numerical columns
-    for column in df_stats.columns:
-        if column not in ['Name','Position', 'Age', 'Height', 'Weight', 'Preferred Foot', 'Expires','Salary', 'Transfer Value', 'Apps']:
-            df_stats[column] = df_stats[column].apply(str).str.replace('-','0')
-            df_stats[column] = df_stats[column].apply(str).str.replace('%','')
-            df_stats[column] = df_stats[column].apply(str).str.replace('cm','')
-            df_stats[column] = df_stats[column].apply(str).str.replace('km','')
-            df_stats[column] = df_stats[column].astype(float)
-            df_stats[column].fillna(0,inplace=True)
-    
-    # Convert 'Height' and 'Weight' columns to float        
-    df_stats['Height'] = df_stats['Height'].apply(str).str.replace('m','').astype(float)
-    df_stats['Weight'] = df_stats['Weight'].apply(str).str.replace('kg','').astype(float)
-    
-    # Standardize Expires contract day
-    df_stats['Expires'] = df_stats['Expires'].apply(str).str.replace('-',free_agent_day)
-    df_stats['Expires'] = pd.to_datetime(df_stats['Expires'], format='%d/%m/%Y')
+    # Parse every stat column once with its own parse rule
+    df_stats = clean_stat_columns(df[stat_columns], free_agent_day)
+    df_stats['Transfer Value'] = fill_unknown_transfer_values(df_stats['Transfer Value'])
 
-    full_df = pd.merge(df_names, df_stats, on='Name', how='left')
+    # Names and stats come from the same rows, align them by position instead of merging on 'Name'
+    full_df = pd.concat([df_names, df_stats.drop(columns='Name')], axis=1)
+    full_df.index = pd.RangeIndex(len(full_df), name=PLAYER_ID)
 
-    # Convert positions to set for better filtering
-    full_df['Position'] = full_df['Position'].apply(convert_positions_to_list)
+    # Convert positions to sets (or masks) for better filtering
+    sets, masks = decode_positions(full_df['Position'])
+    full_df['Position'] = masks if compact else sets
 
     # Compute cumulative statistics
     cumulative_statistics(full_df)
 
     # Calculate roles based on weighted attributes
-    roles_calculation(full_df)
+    if rank_roles:
+        roles_calculation(full_df, roles)
+    else:
+        role_scores(full_df, roles)
+
+    if columns is not None:
+        # Deferred roles are computed from the stats as cleaned, before compact_dataset
+        role_stats = {stat: full_df[stat] for stat in ROLE_STATS if stat in full_df}
+
+    if compact:
+        full_df = compact_dataset(full_df)
+
+    if columns is not None:
+        # Deferred text columns are kept as categories, a few distinct strings coded per player
+        raw = pd.DataFrame({column: df[column].astype('category') if df[column].dtype == object else df[column]
+                            for column in STAT_COLUMNS if column not in stat_columns})
+        raw.index = full_df.index
+        deferred_roles = [role for role in ROLES if role not in roles]
+        full_df = LazyStatFrame(full_df)
+        full_df._deferred = _DeferredColumns(raw, deferred_roles, role_stats, rank_roles, compact)
+
+    return full_df
+
+
+class _DeferredColumns:
+    """
+    Columns left out of a projected load, for the whole dataset.
+
+    Stats are kept as read from the export until they are first needed,
+    then cleaned once and kept. Roles are computed from their stats, the
+    same way as by a full load.
+    """
+
+    def __init__(self, raw, roles, role_stats, rank_roles, compact):
+        self.raw = raw
+        self.roles = roles
+        self.role_stats = role_stats
+        self.rank_roles = rank_roles
+        self.compact = compact
+        self.loaded = {}
+
+    def __contains__(self, column):
+        return column in self.loaded or column in self.raw.columns or column in self.roles
+
+    def get(self, columns):
+        """
+        Returns the deferred columns as a frame of the whole dataset, cleaning them if needed.
+        """
+        roles = [column for column in columns if column in self.roles and column not in self.loaded]
+        stats = [column for column in columns if column in self.raw.columns]
+        for role in roles:
+            stats += [stat for stat in ROLES[role] if stat in self.raw.columns and stat not in stats]
+
+        if stats:
+            cleaned = clean_stat_columns(self.raw[stats])
+            if any(role not in self.loaded for role in self.roles):
+                self.role_stats.update((stat, cleaned[stat]) for stat in stats if stat in ROLE_STATS)
+            if self.compact:
+                cleaned = compact_dataset(cleaned)
+            self.loaded.update(cleaned.items())
+            self.raw = self.raw.drop(columns=stats)
+
+        if roles:
+            role_stats = list(dict.fromkeys(stat for role in roles for stat in ROLES[role]))
+            df_roles = pd.DataFrame({stat: self.role_stats[stat] for stat in role_stats}, index=self.raw.index)
+            if self.rank_roles:
+                roles_calculation(df_roles, roles)
+            else:
+                role_scores(df_roles, roles)
+            df_roles = df_roles[roles]
+            if self.compact:
+                df_roles = compact_dataset(df_roles)
+            self.loaded.update(df_roles.items())
+            if all(role in self.loaded for role in self.roles):
+                self.role_stats = {}
+
+        return pd.DataFrame({column: self.loaded[column] for column in columns}, index=self.raw.index)
+
+
+class LazyStatFrame(pd.DataFrame):
+    """
+    Dataset of a projected load (see load_cleaning_data's columns).
+
+    Behaves like the full dataset: the stats and roles that were not
+    loaded are cleaned for the whole dataset the first time they are
+    selected, e.g. df['Drb/90'] or df[['Name', 'Drb/90']], and reused
+    afterwards. Frames derived from it (filters, copies) keep this
+    behavior. Use with_columns to add them to the frame itself.
+    """
+
+    _metadata = ['_deferred']
+
+    @property
+    def _constructor(self):
+        return LazyStatFrame
+
+    def _deferred_keys(self, key):
+        deferred = getattr(self, '_deferred', None)
+        if deferred is None:
+            return []
+        if isinstance(key, str):
+            key = [key]
+        elif not isinstance(key, list):
+            return []
+        return [column for column in key
+                if isinstance(column, str) and column not in self.columns and column in deferred]
+
+    def __getitem__(self, key):
+        missing = self._deferred_keys(key)
+        if not missing:
+            return super().__getitem__(key)
+        return self.with_columns(missing)[key]
+
+    def with_columns(self, columns):
+        """
+        Returns the frame with these deferred columns added.
+        """
+        missing = self._deferred_keys(list(columns))
+        if not missing:
+            return self
+        values = self._deferred.get(missing)
+        if not values.index.equals(self.index):
+            values = values.loc[self.index]
+        return pd.concat([self, values], axis=1).__finalize__(self)
+
+
+def with_columns(df, columns):
+    """
+    Makes sure the given columns are in a dataset, cleaning them if it comes
+    from a projected load. Other datasets are returned as they are.
+    """
+    if isinstance(df, LazyStatFrame):
+        return df.with_columns(columns)
+    return df
+
+
+def _clean_batch(df, free_agent_day, compact=False):
+    """
+    Cleans a batch of raw rows, up to the role scores.
+    Transfer values and role percentiles are left to the whole dataset.
+    """
+    df_names = df[NAME_COLUMNS].copy()
+    df_names['Division'] = df_names['Division'].apply(str).str.replace('cinch','Scottish')
+
+    df_stats = clean_stat_columns(df[STAT_COLUMNS], free_agent_day)
+    sets, masks = decode_positions(df_stats['Position'])
+    df_stats['Position'] = masks if compact else sets
+    cumulative_statistics(df_stats)
+    role_scores(df_stats)
+
+    return pd.concat([df_names, df_stats.drop(columns='Name')], axis=1)
+
+
+class _ColumnBuffers:
+    """
+    Preallocated columns the cleaned batches are copied into.
+
+    All float columns are rows of a single 2D block, so the final
+    DataFrame is built on top of it without copying.
+    """
+
+    def __init__(self, df, n_rows):
+        self.columns = list(df.columns)
+        self.float_columns = [column for column in self.columns if df[column].dtype == np.float64]
+        self.block = np.empty((len(self.float_columns), n_rows))
+        self.buffers = {column: self.block[i] for i, column in enumerate(self.float_columns)}
+        for column in self.columns:
+            if column not in self.buffers:
+                dtype = df[column].dtype
+                self.buffers[column] = np.empty(n_rows, dtype=dtype if isinstance(dtype, np.dtype) else object)
+        self.n_rows = 0
+
+    def append(self, df):
+        end = self.n_rows + len(df)
+        if end > self.block.shape[1]:
+            self._grow(max(end, 2 * self.block.shape[1]))
+
+        for column in self.columns:
+            buffer = self.buffers[column]
+            values = df[column].to_numpy(dtype=object if buffer.dtype == object else None)
+            if not np.can_cast(values.dtype, buffer.dtype, casting='same_kind'):
+                # A batch typed differently, e.g. a float column with missing ages
+                buffer = self.buffers[column] = buffer.astype(np.result_type(buffer, values))
+            buffer[self.n_rows:end] = values
+        self.n_rows = end
+
+    def _grow(self, size):
+        block = np.empty((self.block.shape[0], size))
+        block[:, :self.n_rows] = self.block[:, :self.n_rows]
+        for i, column in enumerate(self.float_columns):
+            if self.buffers[column].base is self.block:
+                self.buffers[column] = block[i]
+        self.block = block
+        for column, buffer in self.buffers.items():
+            if buffer.base is not block:
+                grown = np.empty(size, dtype=buffer.dtype)
+                grown[:self.n_rows] = buffer[:self.n_rows]
+                self.buffers[column] = grown
+
+    def to_frame(self):
+        n = self.n_rows
+        float_columns = [column for column in self.float_columns if self.buffers[column].base is self.block]
+        positions = [self.float_columns.index(column) for column in float_columns]
+        block = self.block[:, :n] if len(positions) == len(self.float_columns) else self.block[positions, :n]
+        df = pd.DataFrame(block.T, columns=float_columns, copy=False)
+
+        for i, column in enumerate(self.columns):
+            if column not in float_columns:
+                df.insert(i, column, self.buffers[column][:n])
+        return df
+
+
+def load_cleaning_data_chunked(data_path, free_agent_day='30/6/2026', squad=False, chunk_rows=5_000, rank_roles=True,
+                               compact=False):
+    """
+    Loads and cleans player data from an HTML source in batches.
+
+    Rows are parsed, cleaned and typed chunk_rows at a time and copied
+    into preallocated columns, so peak memory stays close to the size of
+    the cleaned dataset. Only the unknown transfer values and the role
+    percentiles are computed on the whole dataset at the end. Names and
+    stats are aligned by row instead of merged on 'Name'.
+
+    Parameters:
+        data_path (str or file-like): Path or file object of the HTML export.
+        free_agent_day (str): Default contract expiration date for missing values (format 'DD/MM/YYYY').
+        squad (bool): If True, loads squad data; otherwise, loads scouting report data.
+        chunk_rows (int): Number of players cleaned at a time.
+        rank_roles (bool): If False, roles are left as raw scores.
+        compact (bool): If True, the dataset is returned in the compact layout of compact_dataset.
+    Returns:
+        pd.DataFrame: A cleaned and structured DataFrame containing player attributes and statistics.
+    """
+    try:
+        n_rows = count_fm_rows(data_path)
+    except ValueError:
+        # Not a file that can be read twice, e.g. a URL
+        return load_cleaning_data(data_path, free_agent_day, squad, rank_roles=rank_roles, compact=compact)
+
+    buffers = None
+    try:
+        for batch in iter_player_table(data_path, chunk_rows):
+            if squad == False:
+                batch = batch.drop(columns=['Inf','Rec'])
+            df_batch = _clean_batch(batch, free_agent_day, compact)
+            if buffers is None:
+                buffers = _ColumnBuffers(df_batch, n_rows)
+            buffers.append(df_batch)
+    except ValueError:
+        # The streaming parser failed after the first batch, see iter_player_table
+        buffers = None
+
+    if buffers is None:
+        # No players to type the columns from, or a file the streaming parser
+        # can't handle: the full load covers both
+        if hasattr(data_path, 'seek'):
+            data_path.seek(0)
+        return load_cleaning_data(data_path, free_agent_day, squad, rank_roles=rank_roles, compact=compact)
+
+    full_df = buffers.to_frame()
+    full_df.index.name = PLAYER_ID
+    full_df['Transfer Value'] = fill_unknown_transfer_values(full_df['Transfer Value'])
+    for column in ['Style', 'Nat', 'Personality', 'Club', 'Division', 'Preferred Foot']:
+        full_df[column] = full_df[column].astype('category')
+
+    if rank_roles:
+        role_percentiles(full_df)
+
+    if compact:
+        full_df = compact_dataset(full_df)
 
     return full_df
 
 
+def _smallest_int_dtype(low, high):
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return None
+
+
+def compact_dataset(df):
+    """
+    Converts a cleaned dataset to its compact layout.
+
+    Stats are stored as float32, whole-number stats (counts, ages, wages)
+    as the smallest integer type that holds them, positions as a position
+    mask (see positions.py) and names and clubs as categories.
+
+    Parameters:
+        df (pd.DataFrame): A dataset returned by load_cleaning_data.
+    Returns:
+        pd.DataFrame: The same dataset using a fraction of the memory.
+    """
+    compact = {}
+    for column in df.columns:
+        values = df[column]
+        if column == 'Position':
+            values = pd.Series(position_masks(values), index=df.index)
+        elif column in ('Name', 'Club') and values.dtype == object:
+            values = values.astype('category')
+        elif pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values):
+            array = values.to_numpy()
+            dtype = None
+            if len(array) and not (array.dtype.kind == 'f' and (np.isnan(array).any() or (array != np.round(array)).any())):
+                dtype = _smallest_int_dtype(array.min(), array.max())
+            if dtype is None and array.dtype.kind == 'f':
+                dtype = np.float32
+            if dtype is not None:
+                values = values.astype(dtype)
+        compact[column] = values
+    return pd.DataFrame(compact, index=df.index)
+
+
+def memory_report(df):
+    """
+    Memory used by every column of a dataset, largest first.
 
+    Returns:
+        pd.DataFrame: The dtype and size of each column, with a final 'Total' row.
+    """
+    sizes = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({'Dtype': df.dtypes.astype(str), 'Bytes': sizes}).sort_values('Bytes', ascending=False)
+    report.loc['Total'] = ['', sizes.sum()]
+    report['MB'] = (report['Bytes'] / 2**20).round(3)
+    return report
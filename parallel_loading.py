@@ -0,0 +1,74 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from load_cleaning_data import load_cleaning_data, role_percentiles, compact_dataset
+from player_index import PLAYER_ID
+
+
+def _source_name(source, i):
+    name = getattr(source, 'name', source if isinstance(source, str) else None)
+    return os.path.basename(name) if isinstance(name, str) else f"File {i + 1}"
+
+
+def _load_unranked(source, free_agent_day, squad, chunk_rows):
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return load_cleaning_data(source, free_agent_day, squad, chunk_rows, rank_roles=False)
+
+
+def load_many(sources, free_agent_day='30/6/2026', squad=False, max_workers=None, chunk_rows=None, compact=False):
+    """
+    Loads and cleans several exports in a process pool and merges them
+    into one dataset.
+
+    Every file is parsed and cleaned by its own worker, the role
+    percentiles are then computed once on the merged dataset.
+
+    Parameters:
+        sources (list): Paths or file objects of the HTML exports.
+        free_agent_day (str): Default contract expiration date for missing values (format 'DD/MM/YYYY').
+        squad (bool): If True, loads squad data; otherwise, loads scouting report data.
+        max_workers (int): Number of worker processes, one per CPU core if None.
+        chunk_rows (int): If set, every file is loaded in batches of chunk_rows players.
+        compact (bool): If True, the merged dataset is returned in the compact layout of compact_dataset.
+    Returns:
+        pd.DataFrame: The merged dataset, with a 'Source File' column naming the export of each player.
+    """
+    names = [_source_name(source, i) for i, source in enumerate(sources)]
+    # File objects can't be sent to other processes, so their content is read and sent instead
+    sources = [source.getvalue() if hasattr(source, 'getvalue')
+               else source.read() if hasattr(source, 'read')
+               else source
+               for source in sources]
+
+    n = len(sources)
+    args = ([free_agent_day] * n, [squad] * n, [chunk_rows] * n)
+    if max_workers is None:
+        max_workers = min(n, os.cpu_count() or 1)
+    if max_workers > 1 and n > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_load_unranked, sources, *args))
+    else:
+        frames = list(map(_load_unranked, sources, *args))
+
+    for df, name in zip(frames, names):
+        df['Source File'] = name
+    categories = [column for column, dtype in frames[0].dtypes.items() if dtype == 'category']
+    # Player IDs are renumbered over the merged dataset
+    full_df = pd.concat(frames, ignore_index=True)
+    full_df.index.name = PLAYER_ID
+    del frames
+
+    # Categories differ between files, so concat falls back to objects
+    for column in categories + ['Source File']:
+        full_df[column] = full_df[column].astype('category')
+
+    role_percentiles(full_df)
+
+    if compact:
+        full_df = compact_dataset(full_df)
+
+    return full_df
@@ -0,0 +1,133 @@
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from filter_index import filter_index, RANGE_FILTERS
+
+
+# Filters of a spec, in the order they are applied by the front ends
+SPEC_FIELDS = ['nationalities', 'divisions', 'positions', 'ranges']
+
+# Position checkboxes of the front ends, laid out as on the pitch
+POSITION_GRID = [
+    [None, "STC", None],
+    ["AML", "AMC", "AMR"],
+    ["ML",  "MC",  "MR"],
+    ["WDL", "DM",  "WDR"],
+    ["DL",  "DC",  "DR"],
+    [None, "GK", None]
+]
+
+# Number of filter results kept by filter_rows
+MAX_CACHED_RESULTS = 256
+
+_results = OrderedDict()
+
+
+def _plain(value):
+    # numpy scalars (e.g. slider bounds read from the data) aren't JSON serializable
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def filter_spec(nationalities=None, divisions=None, positions=None, ranges=None):
+    """
+    Builds a filter spec, a JSON-serializable description of a filter that
+    the Streamlit and Tk front ends share.
+
+    Parameters:
+        nationalities (list): Keep players of these nationalities, every player if None.
+        divisions (list): Keep players of these divisions, every player if None.
+        positions (list): Keep players who can play any of these positions, every player if empty.
+        ranges (dict): Keep players whose value of a column of RANGE_FILTERS is within
+            (min, max), both included. None leaves a side open.
+    Returns:
+        dict: The spec, with sorted values so equal filters give equal specs.
+    """
+    return normalize_spec({'nationalities': nationalities, 'divisions': divisions,
+                           'positions': positions, 'ranges': ranges})
+
+
+def normalize_spec(spec):
+    """
+    Validates a spec (e.g. loaded from JSON) and returns it in canonical form.
+
+    Raises:
+        ValueError: If the spec has unknown fields or range columns.
+    """
+    unknown = set(spec) - set(SPEC_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown filter fields: {sorted(unknown)}.")
+
+    normalized = {}
+    for field in ('nationalities', 'divisions'):
+        values = spec.get(field)
+        normalized[field] = None if values is None else sorted(set(map(str, values)))
+    normalized['positions'] = sorted(set(spec.get('positions') or []))
+
+    ranges = {}
+    for column, (low, high) in (spec.get('ranges') or {}).items():
+        if column not in RANGE_FILTERS:
+            raise ValueError(f"Cannot filter on a range of '{column}'.")
+        if low is not None or high is not None:
+            ranges[column] = [_plain(low), _plain(high)]
+    normalized['ranges'] = dict(sorted(ranges.items()))
+    return normalized
+
+
+def spec_key(spec):
+    """
+    String identifying a spec, equal for equal filters.
+    """
+    return json.dumps(normalize_spec(spec), sort_keys=True)
+
+
+def filter_rows(df, spec):
+    """
+    Row positions of the players of a dataset selected by a filter spec.
+
+    The spec is resolved as a single mask through the filter index of the
+    dataset. Results are memoized by (dataset hash, spec), so going back to
+    an earlier filter is a lookup.
+
+    Parameters:
+        df (pd.DataFrame): A cleaned dataset.
+        spec (dict): A filter spec, see filter_spec.
+    Returns:
+        np.ndarray: Read-only array of the row positions, in dataset order.
+    """
+    index = filter_index(df)
+    spec = normalize_spec(spec)
+    key = (index.digest, json.dumps(spec, sort_keys=True))
+
+    rows = _results.get(key)
+    if rows is not None:
+        _results.move_to_end(key)
+        return rows
+
+    ranges = {column: tuple(bounds) for column, bounds in spec['ranges'].items()}
+    mask = index.mask(spec['positions'], spec['nationalities'], spec['divisions'], ranges)
+    rows = np.flatnonzero(mask)
+    rows.setflags(write=False)
+
+    _results[key] = rows
+    if len(_results) > MAX_CACHED_RESULTS:
+        _results.popitem(last=False)
+    return rows
+
+
+def filter_mask(df, spec):
+    """
+    Boolean array of the players of a dataset selected by a filter spec.
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    mask[filter_rows(df, spec)] = True
+    return mask
+
+
+def apply_filter(df, spec):
+    """
+    Returns the players of a dataset selected by a filter spec, as a new
+    frame built with a single row selection.
+    """
+    return df.iloc[filter_rows(df, spec)]
@@ -0,0 +1,85 @@
+import numpy as np
+
+from frame_cache import frame_cache
+
+
+# Name of the index of a cleaned dataset, the row of each player in the export
+PLAYER_ID = 'Player ID'
+
+
+class PlayerIndex:
+    """
+    Hashed lookups of the players of a dataset by name or by player ID.
+
+    Built once per dataset, every lookup is then a dictionary or hash index
+    access instead of a scan of the 'Name' column.
+    """
+
+    def __init__(self, df):
+        self.ids = df.index
+        self.names = df['Name'].to_numpy()
+        # Players sharing a name are all kept, in dataset order
+        self._positions = df.groupby('Name', observed=True, sort=False).indices
+
+    def positions(self, name):
+        """
+        Row positions of every player with this name, empty if there is none.
+        """
+        return self._positions.get(name, np.empty(0, dtype=np.intp))
+
+    def position(self, name):
+        """
+        Row position of the first player with this name.
+
+        Raises:
+            KeyError: If no player has this name.
+        """
+        positions = self.positions(name)
+        if not len(positions):
+            raise KeyError(f"No player named '{name}'.")
+        return positions[0]
+
+    def position_of_id(self, player_id):
+        """
+        Row position of a player ID.
+
+        Raises:
+            KeyError: If the ID is not in the dataset.
+        """
+        return self.ids.get_loc(player_id)
+
+    def id_of(self, name):
+        """
+        Player ID of the first player with this name.
+        """
+        return self.ids[self.position(name)]
+
+    def name_of(self, player_id):
+        return self.names[self.position_of_id(player_id)]
+
+
+# Indexes of the datasets in use, dropped with their dataset
+_indexes = {}
+
+
+def player_index(df):
+    """
+    Returns the PlayerIndex of a dataset, built on the first call.
+
+    The index is kept while the dataset is alive, so repeated lookups in the
+    same dataset (e.g. on every UI render) don't rebuild it.
+    """
+    return frame_cache(_indexes, df, PlayerIndex)
+
+
+def player_row(df, name=None, player_id=None):
+    """
+    Returns the row of a player, by player ID or else by name (the first
+    player with this name).
+
+    Raises:
+        KeyError: If the player is not in the dataset.
+    """
+    index = player_index(df)
+    position = index.position_of_id(player_id) if player_id is not None else index.position(name)
+    return df.iloc[position]
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+
+# Every position a player can play, in pitch order. Each position is a bit
+# of the position mask stored in the compact layout of a dataset. The list
+# is fixed, as masks are cached on disk and shared between processes: other
+# positions found in an export are left out of the masks.
+POSITIONS = ['GK', 'DL', 'DC', 'DR', 'WBL', 'WBR', 'DM', 'ML', 'MC', 'MR', 'AML', 'AMC', 'AMR', 'STC']
+POSITION_BITS = {position: 1 << i for i, position in enumerate(POSITIONS)}
+
+# Groups of positions players are ranked in by evaluate_position_groups
+POSITION_GROUPS = {
+    'GK': ['GK'],
+    'DC': ['DC'],
+    'DL/DR': ['DL', 'DR'],
+    'WBL/WBR': ['WBL', 'WBR'],
+    'DM': ['DM'],
+    'MC': ['MC'],
+    'ML/MR': ['ML', 'MR'],
+    'AMC': ['AMC'],
+    'AML/AMR': ['AML', 'AMR'],
+    'STC': ['STC'],
+}
+
+# Recommended stats and weights of the position guide, by profile
+POSITION_PROFILES = {
+    "Goalkeeper (GK)": {"Sv %": 0.95, "Saves/90": 0.85, "Cln/90": 0.75, "Pens Saved": 0.70, "xGP": 0.60, "All/90": 0.50, "Shutouts": 0.65},
+    "Centre Back (CB)": {"Hdr %": 0.90, "Clr/90": 0.85, "Tck/90": 0.80, "Int/90": 0.75, "Blk/90": 0.70, "Hdrs W/90": 0.65, "Yel": 0.30},
+    "Fullback (FB/WB)": {"Crs A/90": 0.85, "Drb/90": 0.75, "Tck/90": 0.70, "Int/90": 0.65, "OP-KP/90": 0.60, "Ps C/90": 0.55, "Pas %": 0.50},
+    "Defensive Mid (DM)": {"Tck/90": 0.90, "Int/90": 0.85, "Pr passes/90": 0.70, "Pas %": 0.65, "Blk/90": 0.60, "K Tck/90": 0.55, "Fls": 0.40},
+    "Centre Mid (CM)": {"xA/90": 0.80, "Pr passes/90": 0.75, "Int/90": 0.70, "Ps C/90": 0.65, "K Ps/90": 0.60, "Tck/90": 0.55, "Drb/90": 0.50},
+    "Attacking Mid (AM)": {"xA/90": 0.90, "OP-KP/90": 0.85, "Ch C/90": 0.75, "Drb/90": 0.70, "Gls/90": 0.65, "xG/90": 0.60, "Pas %": 0.50},
+    "Winger (LW/RW)": {"Crs A/90": 0.90, "xA/90": 0.85, "Drb/90": 0.80, "OP-KP/90": 0.75, "Gls/90": 0.60, "Shot %": 0.50, "Tck/90": 0.45},
+    "Striker (ST)": {"xG/90": 1.00, "Gls/90": 0.95, "Conv %": 0.85, "xG/shot": 0.80, "ShT/90": 0.75, "Asts/90": 0.60, "Shot %": 0.55},
+}
+
+# Short names of the profiles of POSITION_PROFILES
+PROFILE_NAMES = {
+    'GK': "Goalkeeper (GK)",
+    'CB': "Centre Back (CB)",
+    'FB': "Fullback (FB/WB)",
+    'DM': "Defensive Mid (DM)",
+    'CM': "Centre Mid (CM)",
+    'AM': "Attacking Mid (AM)",
+    'W': "Winger (LW/RW)",
+    'ST': "Striker (ST)",
+}
+
+# Position strings of the exports already decoded, e.g.
+# 'D/WB (L), AM (RL)' -> (frozenset({'DL', 'WBL', 'AMR', 'AML'}), mask)
+DECODED_POSITIONS = {}
+
+
+def positions_to_mask(positions):
+    """
+    Converts a set of positions like {'DC', 'DM'} into a position mask.
+    Positions missing from POSITIONS have no bit and are left out.
+    """
+    mask = 0
+    for position in positions:
+        mask |= POSITION_BITS.get(position, 0)
+    return mask
+
+
+def split_positions(text):
+    """
+    Splits a position string like 'AM (RL), D/WB/M (L), GK'
+    into ['AMR', 'AML', 'DL', 'WBL', 'ML', 'GK'].
+    Handles:
+    - Positions with multiple roles (e.g. 'D/WB/M')
+    - Optional side info in parentheses (e.g. '(RL)')
+    """
+    role_list = []
+
+    for position in text.split(','):
+        position = position.strip()
+
+        if "(" in position and ")" in position:
+            try:
+                role_part, side_part = position.split(" (")
+                roles = [r.strip() for r in role_part.split("/")]
+                sides = side_part.strip(")").strip()
+
+                for role in roles:
+                    for s in sides:
+                        role_list.append(f"{role}{s}")
+            except ValueError:
+                continue  # Skip malformed inputs
+        else:
+            # No side info, just split roles
+            roles = [r.strip() for r in position.split("/")]
+            role_list.extend(roles)
+
+    return role_list
+
+
+def decode_position(text):
+    """
+    Decodes a position string into its set of positions and its position
+    mask. Every distinct string is parsed only once.
+
+    Returns:
+        tuple: (frozenset of positions, position mask). Missing values decode to no position.
+    """
+    decoded = DECODED_POSITIONS.get(text)
+    if decoded is None:
+        positions = frozenset(split_positions(text)) if isinstance(text, str) else frozenset()
+        decoded = (positions, positions_to_mask(positions))
+        if isinstance(text, str):
+            DECODED_POSITIONS[text] = decoded
+    return decoded
+
+
+def decode_positions(column):
+    """
+    Decodes a column of position strings through a table of its distinct
+    strings, so each of them is parsed once however many players share it.
+
+    Parameters:
+        column (pd.Series): Position strings as read from the export.
+    Returns:
+        tuple: An object array with the set of positions of every player
+        (players with the same position string share one set) and an
+        int64 array of their position masks.
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    decoded = [decode_position(text) for text in uniques]
+
+    sets = np.empty(len(decoded), dtype=object)
+    sets[:] = [set(positions) for positions, _ in decoded]
+    masks = np.fromiter((mask for _, mask in decoded), dtype=np.int64, count=len(decoded))
+    return sets[codes], masks[codes]
+
+
+def mask_to_positions(mask):
+    """
+    Converts a position mask back into a set of positions.
+    """
+    return {position for position, bit in POSITION_BITS.items() if mask & bit}
+
+
+def format_positions(mask):
+    """
+    Readable positions of a mask in pitch order, e.g. 'DC, DM'.
+    """
+    return ', '.join(position for position in POSITIONS if mask & POSITION_BITS[position])
+
+
+def position_masks(column):
+    """
+    Returns the position masks of a 'Position' column, whether it holds
+    masks (compact layout) or sets of positions.
+    """
+    if pd.api.types.is_integer_dtype(column):
+        return column.to_numpy(dtype=np.int64)
+    return np.fromiter((positions_to_mask(positions) for positions in column), dtype=np.int64, count=len(column))
+
+
+def has_any_position(column, selected):
+    """
+    Boolean array of the players that can play any of the selected positions.
+    """
+    selected_mask = 0
+    for position in selected:
+        selected_mask |= POSITION_BITS.get(position, 0)
+    return (position_masks(column) & selected_mask) != 0
+
+
+def group_membership(column, groups=POSITION_GROUPS):
+    """
+    Boolean players x groups array of the players that can play any position of each group.
+    """
+    group_masks = np.array([positions_to_mask(positions) for positions in groups.values()], dtype=np.int64)
+    return (position_masks(column)[:, None] & group_masks) != 0
+
+
+def position_counts(column):
+    """
+    Number of players that can play each position, in pitch order.
+    """
+    masks = position_masks(column)
+    return {position: int(np.count_nonzero(masks & POSITION_BITS[position])) for position in POSITIONS}
+
+
+def with_readable_positions(df):
+    """
+    Returns the frame with positions shown as text, for display.
+    """
+    if 'Position' not in df.columns or not pd.api.types.is_integer_dtype(df['Position']):
+        return df
+    masks = df['Position']
+    labels = {mask: format_positions(mask) for mask in masks.unique()}
+    return df.assign(Position=masks.map(labels))
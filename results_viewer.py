@@ -0,0 +1,79 @@
+import os
+import tempfile
+import weakref
+
+import numpy as np
+import streamlit as st
+
+from positions import with_readable_positions
+from table_sorting import frame_state, sort_order
+
+
+PAGE_SIZES = [25, 50, 100, 250]
+# Rows written at a time when a table is exported
+EXPORT_CHUNK_ROWS = 10_000
+
+def export_csv(df):
+    """
+    Writes a frame to a temporary CSV file EXPORT_CHUNK_ROWS rows at a time,
+    once per frame, and returns its path.
+    """
+    state = frame_state(df)
+    path = state.get('csv')
+    if path is None or not os.path.exists(path):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as file:
+            for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+                chunk = with_readable_positions(df.iloc[start:start + EXPORT_CHUNK_ROWS])
+                chunk.to_csv(file, header=start == 0)
+        state['csv'] = path
+        weakref.finalize(df, os.remove, path)
+    return path
+
+
+def show_results(df, key, default_columns=None, file_name="players.csv"):
+    """
+    Paginated, column-projected view of a results table.
+
+    Only the rows of the visible page and the chosen columns are sent to
+    the browser. Sorting is done on the server on the whole frame, and the
+    full table is downloaded as a file written in chunks instead of being
+    rendered.
+
+    Parameters:
+        df (pd.DataFrame): The table to show, e.g. a cached filter or evaluation result.
+        key (str): Prefix of the widget keys, unique on the page.
+        default_columns (list): Columns shown at first, all of them if None.
+        file_name (str): Name of the downloaded file.
+    """
+    columns = list(df.columns)
+    if default_columns is None:
+        default_columns = columns
+    default_columns = [column for column in default_columns if column in columns]
+
+    selected = st.multiselect("Columns", columns, default=default_columns, key=f"{key}_columns")
+    col1, col2, col3, col4 = st.columns(4)
+    sort_column = col1.selectbox("Sort by", ["(none)"] + columns, key=f"{key}_sort")
+    ascending = col2.radio("Order", ["Descending", "Ascending"], horizontal=True, key=f"{key}_order") == "Ascending"
+    page_size = col3.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    n_pages = max(1, -(-len(df) // page_size))
+    # The table may have shrunk since the page was chosen
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = col4.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    if sort_column == "(none)":
+        rows = np.arange(start, min(start + page_size, len(df)))
+    else:
+        rows = sort_order(df, sort_column, ascending)[start:start + page_size]
+
+    st.dataframe(with_readable_positions(df.iloc[rows][selected or columns]), use_container_width=True)
+    st.caption(f"Rows {start + 1 if len(df) else 0}-{start + len(rows)} of {len(df)}")
+
+    if st.button("Prepare download of the full table", key=f"{key}_export"):
+        export_csv(df)
+    path = frame_state(df).get('csv')
+    if path and os.path.exists(path):
+        with open(path, 'rb') as file:
+            st.download_button("⬇️ Download CSV", file, file_name=file_name, mime="text/csv", key=f"{key}_download")
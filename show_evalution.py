@@ -1,6 +1,132 @@
 import tkinter as tk
 from tkinter import ttk
 
+import numpy as np
+
+from positions import with_readable_positions
+from table_sorting import sort_order
+
+
+# Rows moved by a turn of the mouse wheel
+WHEEL_ROWS = 3
+SORT_ARROWS = {True: " ▲", False: " ▼"}
+
+
+class VirtualTable:
+    """
+    Treeview showing a frame of any length with a fixed set of items.
+
+    Only the rows that fit in the window have an item. Scrolling and
+    sorting move a window over the row order of the frame and refill those
+    items, so opening, scrolling and sorting don't depend on the row count.
+    Clicking a column heading sorts by that column, with orderings computed
+    once per column and direction (see table_sorting.sort_order).
+    """
+
+    def __init__(self, parent, df):
+        self.df = df
+        self.order = None
+        self.sort_column = None
+        self.ascending = False
+        self.offset = 0
+        self.items = []
+
+        self.tree = ttk.Treeview(parent, columns=list(df.columns), show="headings")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        for col in df.columns:
+            self.tree.heading(col, text=col, command=lambda col=col: self.sort_by(col))
+            self.tree.column(col, anchor="w")
+
+        self.tree.bind("<Configure>", lambda event: self.resize())
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(WHEEL_ROWS))
+        self.tree.bind("<Prior>", lambda event: self.scroll(-len(self.items)))
+        self.tree.bind("<Next>", lambda event: self.scroll(len(self.items)))
+
+    def _row_height(self):
+        height = ttk.Style().lookup("Treeview", "rowheight")
+        return int(height) if height else 20
+
+    def visible_rows(self):
+        """
+        Number of rows that fit in the Treeview, below its headings.
+        """
+        row_height = self._row_height()
+        heading_height = self.tree.bbox(self.items[0])[1] if self.items and self.tree.bbox(self.items[0]) else row_height
+        return max(1, (self.tree.winfo_height() - heading_height) // row_height)
+
+    def resize(self):
+        """
+        Adds or removes items to match the rows that fit, then refills them.
+        """
+        n_items = min(self.visible_rows(), len(self.df))
+        while len(self.items) < n_items:
+            self.items.append(self.tree.insert("", "end"))
+        if len(self.items) > n_items:
+            self.tree.delete(*self.items[n_items:])
+            del self.items[n_items:]
+        self.refresh()
+
+    def refresh(self):
+        """
+        Fills the items with the rows of the frame from the current offset.
+        """
+        n_rows = len(self.df)
+        self.offset = max(0, min(self.offset, n_rows - len(self.items)))
+        if self.order is None:
+            rows = np.arange(self.offset, self.offset + len(self.items))
+        else:
+            rows = self.order[self.offset:self.offset + len(self.items)]
+
+        page = with_readable_positions(self.df.iloc[rows])
+        for item, values in zip(self.items, page.itertuples(index=False)):
+            self.tree.item(item, values=list(values))
+        # Items are reused for other players, a selection would follow the item
+        self.tree.selection_remove(self.tree.selection())
+
+        if n_rows:
+            self.scrollbar.set(self.offset / n_rows, (self.offset + len(self.items)) / n_rows)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.refresh()
+
+    def yview(self, *args):
+        """
+        Command of the scrollbar, as for Tk's own scrollable widgets.
+        """
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.df))
+            self.refresh()
+        elif args[0] == "scroll":
+            count, what = int(args[1]), args[2]
+            self.scroll(count * (len(self.items) if what == "pages" else 1))
+
+    def _on_wheel(self, event):
+        self.scroll(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def sort_by(self, column):
+        """
+        Sorts by a column, descending first, and in the other direction on
+        the next click of the same column.
+        """
+        if self.sort_column is not None:
+            self.tree.heading(self.sort_column, text=self.sort_column)
+        self.ascending = not self.ascending if column == self.sort_column else False
+        self.sort_column = column
+        self.tree.heading(column, text=column + SORT_ARROWS[self.ascending])
+
+        self.order = sort_order(self.df, column, self.ascending)
+        self.offset = 0
+        self.refresh()
+
+
 def show_evaluation_table(df):
     # Create new popup window
     window = tk.Toplevel()
@@ -9,25 +135,8 @@ def show_evaluation_table(df):
     frame = ttk.Frame(window)
     frame.pack(fill='both', expand=True)
 
-    # Create Treeview
-    tree = ttk.Treeview(frame)
-    tree.pack(side='left', fill='both', expand=True)
-
-    # Add vertical scrollbar
-    vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-    vsb.pack(side='right', fill='y')
-    tree.configure(yscrollcommand=vsb.set)
-
-    # Define columns
-    tree["columns"] = list(df.columns)
-    tree["show"] = "headings"  # Hide first empty column
-
-    for col in df.columns:
-        tree.heading(col, text=col)
-        tree.column(col, anchor="w")
-
-    # Insert data rows
-    for _, row in df.iterrows():
-        tree.insert("", "end", values=list(row))
+    # Items are created for the visible rows only, when the window is laid out
+    table = VirtualTable(frame, df)
 
     window.geometry("800x400")
+    return table
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from frame_cache import frame_cache
+from load_cleaning_data import with_columns
+from player_index import PLAYER_ID
+from table_sorting import rank_rows
+
+
+# Bound of the number of similarities computed at a time by query_many (8 bytes each)
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def _block_top_k(scores, top_k):
+    """
+    Rows of the top_k best scores of every column of a block, ties at the
+    k-th place broken by row, as rank_rows does.
+
+    Returns:
+        np.ndarray: columns x top_k array of row positions in the block, in row order.
+    """
+    n_rows = len(scores)
+    threshold = np.partition(scores, n_rows - top_k, axis=0)[n_rows - top_k]
+    above = scores > threshold
+    tied = scores == threshold
+    keep = above | (tied & (np.cumsum(tied, axis=0) <= top_k - above.sum(axis=0)))
+    return np.nonzero(keep.T)[1].reshape(scores.shape[1], top_k)
+
+
+class SimilarityIndex:
+    """
+    Cosine similarity search over the players of a dataset on a set of stats.
+
+    The stats of every player are stored once as a contiguous matrix of
+    unit-length rows, with the norms of the rows kept, so a query is a
+    single matrix-vector product followed by a partial selection of the
+    best players. Built once per (dataset, stats), see similarity_index.
+    """
+
+    def __init__(self, df, stats):
+        self.stats = list(stats)
+        # Stats left out of a projected load are cleaned here
+        values = np.ascontiguousarray(with_columns(df, self.stats)[self.stats].to_numpy(dtype=np.float64))
+        # Same normalization as sklearn's cosine_similarity, rows of zeros stay zeros
+        self.norms = np.sqrt(np.einsum('ij,ij->i', values, values))
+        self.rows = values / np.where(self.norms == 0, 1, self.norms)[:, None]
+        self.ids = df.index
+        self.names = df['Name'].to_numpy()
+
+    def scores(self, vector, rows=None):
+        """
+        Cosine similarity of every player (or of the players at rows) with a vector of the stats.
+        """
+        vector = np.asarray(vector, dtype=np.float64).reshape(-1)
+        norm = np.sqrt(vector @ vector)
+        candidates = self.rows if rows is None else self.rows[rows]
+        return candidates @ (vector / (norm if norm else 1))
+
+    def query(self, vector, top_k=None, rows=None):
+        """
+        Most similar players to a vector of the stats.
+
+        Parameters:
+            vector (array-like): Values of the stats, in the order of the index.
+            top_k (int): Number of players returned, every player if None.
+            rows (np.ndarray): If set, the sorted row positions of the only players
+                searched, e.g. from player_filters.filter_rows. The other players
+                are left out before any similarity is computed.
+        Returns:
+            tuple: Row positions of the players, most similar first (ties in
+            dataset order), and their similarity.
+        """
+        scores = self.scores(vector, rows)
+        best = rank_rows(scores, top_k)
+        return (best if rows is None else rows[best]), scores[best]
+
+    def query_many(self, vectors, top_k, row_masks=None, query_masks=None, rows=None):
+        """
+        Most similar players to each of many vectors of the stats.
+
+        Similarities are computed as matrix products of blocks of players by
+        all the vectors, with at most MAX_BLOCK_CELLS similarities in memory,
+        and only the best top_k players of every vector are kept across blocks.
+
+        Parameters:
+            vectors (array-like): One vector of the stats per row.
+            top_k (int): Number of players returned for every vector.
+            row_masks, query_masks (np.ndarray): If set, the position masks of the
+                players of the index and of the vectors. Only players sharing a
+                position with a vector are returned for it.
+            rows (np.ndarray): If set, the sorted row positions of the only players searched.
+        Returns:
+            tuple: vectors x top_k arrays (fewer columns if the index has fewer players)
+            of the row positions of the players, most
+            similar first (ties in dataset order), and of their similarity. Missing
+            players (fewer than top_k candidates) have row -1 and similarity -inf.
+        """
+        vectors = np.asarray(vectors, dtype=np.float64)
+        norms = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+        queries = (vectors / np.where(norms == 0, 1, norms)[:, None]).T
+        n_queries = len(vectors)
+        block_rows = max(top_k, MAX_BLOCK_CELLS // max(n_queries, 1))
+
+        best_rows = np.empty((n_queries, 0), dtype=np.intp)
+        best_scores = np.empty((n_queries, 0))
+        n_candidates = len(self.rows) if rows is None else len(rows)
+        for start in range(0, n_candidates, block_rows):
+            block = slice(start, start + block_rows) if rows is None else rows[start:start + block_rows]
+            scores = self.rows[block] @ queries
+            scores[np.isnan(scores)] = -np.inf
+            if row_masks is not None:
+                shared = (row_masks[block, None] & query_masks) != 0
+                scores[~shared] = -np.inf
+
+            if len(scores) > top_k:
+                top = _block_top_k(scores, top_k)
+            else:
+                top = np.broadcast_to(np.arange(len(scores)), (n_queries, len(scores)))
+            block_scores = np.take_along_axis(scores.T, top, axis=1)
+            found = top + start
+            if rows is not None:
+                found = rows[found]
+
+            # Merge with the best players of the previous blocks, by similarity then row
+            best_rows = np.concatenate([best_rows, found], axis=1)
+            best_scores = np.concatenate([best_scores, block_scores], axis=1)
+            order = np.lexsort((best_rows, -best_scores))[:, :top_k]
+            best_rows = np.take_along_axis(best_rows, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        best_rows = np.where(best_scores == -np.inf, -1, best_rows)
+        return best_rows, best_scores
+
+    def similar(self, vector, top_k=None, rows=None):
+        """
+        Most similar players to a vector of the stats, as returned by similarity_calculation.
+        """
+        rows, scores = self.query(vector, top_k, rows)
+        return pd.DataFrame({PLAYER_ID: self.ids[rows], 'Name': self.names[rows], 'Similarity': scores})
+
+
+# Indexes of the datasets in use by stats, dropped with their dataset
+_indexes = {}
+
+
+def similarity_index(df, stats):
+    """
+    Returns the SimilarityIndex of a dataset on a list of stats, built on the first call.
+    """
+    indexes = frame_cache(_indexes, df, lambda _: {})
+    if tuple(stats) not in indexes:
+        indexes[tuple(stats)] = SimilarityIndex(df, stats)
+    return indexes[tuple(stats)]
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from positions import with_readable_positions
+
+
+# Environment variable (or Streamlit secret) holding the Gemini API key
+API_KEY_VARIABLE = 'GEMINI_API_KEY'
+REVIEW_MODEL = 'gemini-2.5-flash'
+
+# Reviews kept by a ReviewService, and reviews generated at the same time
+MAX_CACHED_REVIEWS = 32
+REVIEW_WORKERS = 2
+
+REVIEW_PROMPT = """
+You are a professional football data analyst.
+Using the squad statistics below, create a detailed squad review
+in a scouting report style. Include:
+- Overall team performance
+- Key strengths
+- Weaknesses
+- Standout players
+- Recommendations for improvement by suggesting potential transfers or tactical changes
+- For potential transfers, suggest crucial statistics to focus on
+Format the response in clear paragraphs with section headings.
+Squad statistics:
+{squad_statistics}
+"""
+
+
+def squad_prompt(df_squad):
+    """
+    Prompt of the review of a squad, with the statistics of every player.
+    """
+    statistics = with_readable_positions(df_squad).astype(str).to_dict()
+    return REVIEW_PROMPT.format(squad_statistics=json.dumps(statistics, indent=2))
+
+
+class GeminiBackend:
+    """
+    Generates reviews with a Gemini model through google-genai.
+    """
+
+    def __init__(self, api_key, model=REVIEW_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self.name = f"gemini/{model}"
+
+    def generate(self, prompt):
+        # Imported when a review is requested, the stub backend runs without google-genai
+        from google import genai
+
+        client = genai.Client(api_key=self.api_key)
+        return client.models.generate_content(model=self.model, contents=[prompt]).text
+
+
+class StubBackend:
+    """
+    Local backend returning a placeholder review, to run the review flow
+    offline or without an API key.
+    """
+
+    name = 'stub'
+
+    def generate(self, prompt):
+        return ("## Squad review (offline)\n\n"
+                f"No review model is configured. Set {API_KEY_VARIABLE} to generate reviews with "
+                f"{REVIEW_MODEL}. The prompt holds {len(prompt):,} characters of squad statistics.")
+
+
+def review_backend(api_key=None):
+    """
+    Gemini backend with api_key, or the key of the API_KEY_VARIABLE environment
+    variable. The stub backend if there is no key.
+    """
+    api_key = api_key or os.environ.get(API_KEY_VARIABLE)
+    return GeminiBackend(api_key) if api_key else StubBackend()
+
+
+class ReviewService:
+    """
+    Generates squad reviews in background threads, once per prompt.
+
+    Reviews are requested with a prompt and read with the key returned,
+    so a page can render while a review is generated and read it on a
+    later run. Results are kept by a hash of the backend and the prompt
+    (which holds the squad statistics), the MAX_CACHED_REVIEWS most
+    recent ones. Failed reviews are generated again on the next request.
+
+    Parameters:
+        backend: Any object with a name and a generate(prompt) method
+            returning the review, e.g. GeminiBackend or StubBackend.
+    """
+
+    def __init__(self, backend, max_workers=REVIEW_WORKERS, max_cached=MAX_CACHED_REVIEWS):
+        self.backend = backend
+        self.max_cached = max_cached
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='squad-review')
+        self._reviews = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, prompt):
+        return hashlib.sha256(f"{self.backend.name}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def request(self, prompt):
+        """
+        Starts generating the review of a prompt, unless it is cached or being generated.
+
+        Returns:
+            str: The key of the review, see result.
+        """
+        key = self.key(prompt)
+        with self._lock:
+            future = self._reviews.get(key)
+            if future is None or (future.done() and future.exception() is not None):
+                self._reviews[key] = self._executor.submit(self.backend.generate, prompt)
+            self._reviews.move_to_end(key)
+
+            # Oldest finished reviews are dropped first, pending ones are kept
+            for old_key in [old_key for old_key, old in self._reviews.items() if old.done()]:
+                if len(self._reviews) <= self.max_cached:
+                    break
+                del self._reviews[old_key]
+        return key
+
+    def result(self, key):
+        """
+        State of a requested review.
+
+        Returns:
+            tuple: ('done', review), ('pending', None), ('failed', error message),
+            or ('missing', None) if the review was never requested or was dropped.
+        """
+        with self._lock:
+            future = self._reviews.get(key)
+        if future is None:
+            return 'missing', None
+        if not future.done():
+            return 'pending', None
+        if future.exception() is not None:
+            return 'failed', str(future.exception())
+        return 'done', future.result()
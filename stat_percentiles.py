@@ -0,0 +1,130 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from frame_cache import frame_cache
+from load_cleaning_data import percentile_ranks
+
+
+# Ways the stats of a player are scaled before they are weighted: as they
+# are, by percentile rank (0-100) or min-max normalized (0-1) in the dataset
+NORMALIZATIONS = ['raw', 'percentile', 'minmax']
+
+
+def table_stats(df):
+    """
+    Numeric columns of a dataset that get percentiles, every stat, cumulative statistic and role.
+    """
+    return [column for column in df.columns
+            if column != 'Position' and pd.api.types.is_numeric_dtype(df[column])]
+
+
+class StatTable:
+    """
+    Percentile ranks and min-max normalized values of the stats of a dataset.
+
+    Each stat is ranked once over the whole dataset with a single sort and
+    kept as float32, see stat_table. Missing values get no percentile.
+    Evaluations and radar charts read from it instead of ranking the stats
+    again.
+    """
+
+    def __init__(self, df):
+        # The table is cached for as long as the dataset is alive, it must not keep it alive
+        self._dataset = weakref.ref(df)
+        self.index = df.index
+        self.percentiles = {}
+        self.normalized = {}
+        self._sorted = {}
+
+    def add(self, stats):
+        """
+        Ranks the stats that are not in the table yet.
+        """
+        missing = [stat for stat in stats if stat not in self.percentiles]
+        if not missing:
+            return
+        # A projected load cleans deferred stats here
+        df = self._dataset()[missing]
+        for stat in missing:
+            values = df[stat].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+
+            percentiles = np.full(len(values), np.nan, dtype=np.float32)
+            percentiles[valid] = percentile_ranks(values[valid])
+
+            normalized = np.full(len(values), np.nan, dtype=np.float32)
+            if valid.any():
+                low, high = values[valid].min(), values[valid].max()
+                normalized[valid] = (values[valid] - low) / (high - low if high > low else 1)
+
+            self.percentiles[stat] = percentiles
+            self.normalized[stat] = normalized
+
+    def column(self, stat, normalization='percentile'):
+        """
+        Percentile ranks ('percentile') or normalized values ('minmax') of a stat for every player.
+        """
+        self.add([stat])
+        if normalization == 'percentile':
+            return self.percentiles[stat]
+        if normalization == 'minmax':
+            return self.normalized[stat]
+        raise ValueError(f"Unknown normalization '{normalization}', expected 'percentile' or 'minmax'.")
+
+    def rows_of(self, df):
+        """
+        Row positions in the dataset of the players of df, e.g. a filter result.
+
+        Raises:
+            ValueError: If df has players that are not in the dataset.
+        """
+        rows = self.index.get_indexer(df.index)
+        if (rows < 0).any():
+            raise ValueError("Some players are not in the dataset of the table.")
+        return rows
+
+    def frame(self, stats, normalization='percentile', df=None):
+        """
+        Table of the given stats, for every player of the dataset or of df.
+        """
+        rows = None if df is None else self.rows_of(df)
+        columns = {stat: self.column(stat, normalization) for stat in stats}
+        if rows is not None:
+            columns = {stat: values[rows] for stat, values in columns.items()}
+        return pd.DataFrame(columns, index=self.index if df is None else df.index)
+
+    def percentile_of(self, stat, values):
+        """
+        Percentile ranks values would have among the players of the dataset,
+        e.g. the stats of a squad player among the scouted players.
+        """
+        if stat not in self._sorted:
+            column = self._dataset()[stat].to_numpy(dtype=float)
+            self._sorted[stat] = np.sort(column[~np.isnan(column)])
+        ranked = self._sorted[stat]
+        values = np.asarray(values, dtype=float)
+        below = np.searchsorted(ranked, values, side='left')
+        up_to = np.searchsorted(ranked, values, side='right')
+        # Same as percentileofscore(ranked, value, kind='rank')
+        return (below + up_to + (up_to > below)) * (50.0 / max(len(ranked), 1))
+
+
+# Tables of the datasets in use, dropped with their dataset
+_tables = {}
+
+
+def stat_table(df, stats=None):
+    """
+    Returns the StatTable of a dataset, built on the first call.
+
+    Parameters:
+        df (pd.DataFrame): A cleaned dataset.
+        stats (list): Stats ranked right away, e.g. table_stats(df) when the
+            dataset is loaded. Other stats are ranked when first read.
+    """
+    table = frame_cache(_tables, df, StatTable)
+    if stats:
+        table.add(stats)
+    return table
@@ -0,0 +1,54 @@
+import numpy as np
+
+from frame_cache import frame_cache
+
+
+# State kept for the tables in use (sort orders, exported files), dropped with their table
+_frame_state = {}
+
+
+def frame_state(df):
+    """
+    Dictionary of cached state of a table, kept while the table is alive.
+    """
+    return frame_cache(_frame_state, df, lambda _: {})
+
+
+def sort_order(df, column, ascending=True):
+    """
+    Row positions of a table sorted by a column, computed once per table
+    and column. Ties keep the table order, missing values go last.
+    """
+    orders = frame_state(df).setdefault('orders', {})
+    if (column, ascending) not in orders:
+        values = df[column].reset_index(drop=True)
+        orders[column, ascending] = values.sort_values(ascending=ascending, kind='stable').index.to_numpy()
+    return orders[column, ascending]
+
+
+def rank_rows(ratings, top_k=None):
+    """
+    Row positions of the players by descending rating, ties in dataset
+    order and missing ratings last.
+
+    Parameters:
+        ratings (np.ndarray): The rating of each player.
+        top_k (int): Only rank the top_k best players. They are found with a
+            partial selection, and only they are sorted.
+    Returns:
+        np.ndarray: The row positions, best player first.
+    """
+    keys = np.where(np.isnan(ratings), -np.inf, ratings)
+    n_rows = len(keys)
+    if top_k is None or top_k >= n_rows:
+        # A stable sort of the negated ratings keeps ties in dataset order
+        return np.argsort(-keys, kind='stable')
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Everyone above the k-th best rating, then the first players tied with it
+    threshold = np.partition(keys, n_rows - top_k)[n_rows - top_k]
+    above = np.flatnonzero(keys > threshold)
+    tied = np.flatnonzero(keys == threshold)[:top_k - len(above)]
+    rows = np.sort(np.concatenate([above, tied]))
+    return rows[np.argsort(-keys[rows], kind='stable')]
@@ -0,0 +1,105 @@
+import io
+import random
+
+import pytest
+
+from load_cleaning_data import NAME_COLUMNS, STAT_COLUMNS, compact_dataset, load_cleaning_data
+
+
+POSITIONS = ["D (C)", "D/WB/M (L), AM (RL)", "GK", "AM (C), ST (C)", "DM", "M/AM (RLC)", "D (RC), DM", "WB (R)",
+             "ST (C)", "AM (L)", "D/WB (RL)", "M (C)"]
+
+
+def _cell(column, rng, i):
+    # Values in the formats of a Football Manager export
+    if column == 'Name':
+        return f"Player {i}"
+    if column == 'Style':
+        return rng.choice(['Quiet', 'Outspoken', '-'])
+    if column == 'Nat':
+        return rng.choice(['ENG', 'FRA', 'ESP', 'BRA', 'SCO'])
+    if column == 'Personality':
+        return rng.choice(['Balanced', 'Resolute', 'Driven'])
+    if column == 'Club':
+        return f"Club {rng.randint(0, 20)}"
+    if column == 'Division':
+        return rng.choice(['cinch Premiership', 'English Premier Division', 'Ligue 1'])
+    if column == 'Position':
+        return rng.choice(POSITIONS)
+    if column == 'Age':
+        return str(rng.randint(16, 38))
+    if column == 'Height':
+        return f"{rng.uniform(1.6, 2.0):.2f}m"
+    if column == 'Weight':
+        return f"{rng.randint(60, 95)} kg"
+    if column == 'Preferred Foot':
+        return rng.choice(['Right', 'Left', 'Either'])
+    if column == 'Expires':
+        return rng.choice(['-', f"30/6/{rng.randint(2025, 2030)}"])
+    if column == 'Salary':
+        return rng.choice(['-', f"£{rng.randint(1, 300)},{rng.randint(100, 999)} p/w", f"£{rng.randint(100, 999)} p/w"])
+    if column == 'Transfer Value':
+        return rng.choice(['Not for Sale', 'Unknown', f"£{rng.randint(1, 900)}K", f"£{rng.randint(1, 90)}M",
+                           f"£{rng.randint(100, 900)}K - £{rng.randint(1, 9)}M"])
+    if column == 'Apps':
+        return rng.choice(['-', str(rng.randint(0, 40)), f"{rng.randint(0, 40)} ({rng.randint(0, 15)})"])
+    if column == 'Mins':
+        return rng.choice(['-', str(rng.randint(0, 4000))])
+    if column == 'Distance':
+        return rng.choice(['-', f"{rng.uniform(0, 400):.1f}km"])
+    if '%' in column:
+        return rng.choice(['-', f"{rng.randint(0, 100)}%"])
+    # Few distinct values, so players often tie on a stat
+    return rng.choice(['-', f"{rng.randint(0, 20) / 4:.2f}", str(rng.randint(0, 10))])
+
+
+def export_html(n_players, seed=0, squad=False):
+    """
+    HTML of a Scout (or Squad) view export of n_players random players.
+    """
+    rng = random.Random(seed)
+    columns = ([] if squad else ['Inf', 'Rec']) + NAME_COLUMNS + [column for column in STAT_COLUMNS if column != 'Name']
+    lines = ['<html>', '<head><meta charset="utf-8"><title>FM</title></head>', '<body>', '<table>',
+             '<tr bgcolor="#BFBFBF">' + ''.join(f"<th>{column}</th>" for column in columns) + '</tr>']
+    for i in range(n_players):
+        cells = ['' if column == 'Inf' else '75%' if column == 'Rec' else _cell(column, rng, i) for column in columns]
+        lines.append('<tr bgcolor="#EEEEEE">' + ''.join(f"<td>{cell}</td>" for cell in cells) + '</tr>')
+    lines += ['</table>', '</body>', '</html>', '']
+    return '\n'.join(lines)
+
+
+@pytest.fixture(scope='session')
+def make_export():
+    return export_html
+
+
+@pytest.fixture(scope='session')
+def scout_html():
+    return export_html(600, seed=1)
+
+
+@pytest.fixture(scope='session')
+def squad_html():
+    return export_html(30, seed=2, squad=True)
+
+
+@pytest.fixture
+def scout_file(tmp_path, scout_html):
+    path = tmp_path / 'scout.html'
+    path.write_text(scout_html, encoding='utf-8')
+    return path
+
+
+@pytest.fixture(scope='session')
+def scout_df(scout_html):
+    return load_cleaning_data(io.StringIO(scout_html))
+
+
+@pytest.fixture(scope='session')
+def compact_scout_df(scout_df):
+    return compact_dataset(scout_df)
+
+
+@pytest.fixture(scope='session')
+def squad_df(squad_html):
+    return compact_dataset(load_cleaning_data(io.StringIO(squad_html), squad=True))
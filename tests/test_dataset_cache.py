@@ -0,0 +1,60 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+import dataset_cache
+from dataset_cache import DatasetCache, hash_export, load_cleaning_data_cached
+from load_cleaning_data import load_cleaning_data
+
+
+def test_hash_of_paths_and_files(scout_file, scout_html):
+    digest = hash_export(str(scout_file))
+    with open(scout_file, 'rb') as file:
+        assert hash_export(file) == digest
+        assert file.tell() == 0
+    with open(scout_file, encoding='utf-8', newline='') as file:
+        assert hash_export(file) == digest
+    assert hash_export(io.BytesIO(scout_html.encode('utf-8'))) == digest
+    assert hash_export(io.StringIO(scout_html, newline='')) == digest
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_cached_dataset_same_as_load(tmp_path, scout_file, compact, monkeypatch):
+    cache = DatasetCache(str(tmp_path / 'cache'))
+    expected = load_cleaning_data(str(scout_file), compact=compact)
+    pd.testing.assert_frame_equal(load_cleaning_data_cached(str(scout_file), cache=cache, compact=compact), expected)
+
+    # The second load reads the cached file
+    monkeypatch.setattr(dataset_cache, 'load_cleaning_data', None)
+    pd.testing.assert_frame_equal(load_cleaning_data_cached(str(scout_file), cache=cache, compact=compact), expected)
+
+
+def test_keys_depend_on_content_and_arguments(tmp_path, scout_file, squad_html):
+    cache = DatasetCache(str(tmp_path))
+    key = cache.key(str(scout_file))
+    assert cache.key(str(scout_file)) == key
+    assert len({key, cache.key(str(scout_file), squad=True), cache.key(str(scout_file), compact=True),
+                cache.key(str(scout_file), free_agent_day='1/7/2027'),
+                cache.key(io.BytesIO(squad_html.encode('utf-8')))}) == 5
+
+
+def test_evicts_other_versions_and_least_recently_used(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=0)
+    stale = tmp_path / 'v0-old.feather'
+    stale.write_bytes(b'')
+    df = pd.DataFrame({'Name': ['A'], 'Position': [{'DC'}]})
+    cache.put('a', df)
+    assert not stale.exists()
+    # Over max_bytes, even the entry just written is evicted
+    assert cache.get('a') is None
+
+    cache.max_bytes = 1 << 20
+    cache.put('a', df)
+    os.utime(cache._path('a'), (0, 0))
+    cache.put('b', df)
+    cache.max_bytes = os.path.getsize(cache._path('b'))
+    cache.evict()
+    assert cache.get('a') is None
+    assert cache.get('b')['Position'][0] == {'DC'}
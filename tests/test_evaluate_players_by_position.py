@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler
+
+from evaluate_players_by_position import (POSITION_PROFILES, evaluate_players_by_position, evaluate_position_groups,
+                                          evaluate_profiles, inverse_stats, position_group_table)
+from player_filters import apply_filter, filter_spec
+from positions import POSITION_GROUPS, with_readable_positions
+
+
+WEIGHTS = {'Tck/90': 0.9, 'Int/90': 0.85, 'Pas %': 0.65, 'Fls': 0.4}
+
+
+def legacy_evaluation(df, stat_weights):
+    # The implementation the copy-free evaluation replaced, with a stable sort
+    df_eval = df.copy()
+    weighted_cols = []
+    for stat, weight in stat_weights.items():
+        values = df_eval[stat].astype(float)
+        df_eval[stat + "_weighted"] = - values * weight if stat in inverse_stats else values * weight
+        weighted_cols.append(stat + "_weighted")
+    raw_rating = df_eval[weighted_cols].sum(axis=1) / sum(stat_weights.values()) * 100
+    df_eval['Rating'] = MinMaxScaler(feature_range=(0, 100)).fit_transform(raw_rating.values.reshape(-1, 1)).round(2)
+    df_eval = df_eval[['Name', 'Club', 'Age', 'Position', 'Rating'] + list(stat_weights)]\
+        .sort_values(by='Rating', ascending=False, kind='stable').reset_index(drop=True)
+    return with_readable_positions(df_eval)
+
+
+@pytest.mark.parametrize('dataset', ['scout_df', 'compact_scout_df'])
+def test_same_as_legacy_evaluation(request, dataset):
+    df = request.getfixturevalue(dataset)
+    pd.testing.assert_frame_equal(evaluate_players_by_position(df, WEIGHTS), legacy_evaluation(df, WEIGHTS))
+
+    filtered = apply_filter(df, filter_spec(positions=['DC', 'DM']))
+    pd.testing.assert_frame_equal(evaluate_players_by_position(filtered, WEIGHTS), legacy_evaluation(filtered, WEIGHTS))
+
+
+@pytest.mark.parametrize('top_k', [0, 1, 10, 57, 600, 1000])
+def test_top_k_same_as_head_of_full_evaluation(scout_df, top_k):
+    full = evaluate_players_by_position(scout_df, WEIGHTS)
+    assert full['Rating'].duplicated().any()
+    pd.testing.assert_frame_equal(evaluate_players_by_position(scout_df, WEIGHTS, top_k=top_k), full.head(top_k),
+                                  check_dtype=top_k > 0)
+
+
+def test_invalid_weights(scout_df):
+    with pytest.raises(ValueError):
+        evaluate_players_by_position(scout_df, {'Tck/90': 0})
+    with pytest.raises(ValueError):
+        evaluate_players_by_position(scout_df, {'Not a stat': 1})
+    with pytest.raises(TypeError):
+        evaluate_players_by_position(scout_df, {'Name': 1})
+
+
+def test_no_players(scout_df):
+    assert evaluate_players_by_position(scout_df.iloc[:0], WEIGHTS).empty
+
+
+def test_profiles_same_as_evaluating_each_profile(compact_scout_df):
+    ratings = evaluate_profiles(compact_scout_df)
+    assert list(ratings.columns) == list(POSITION_PROFILES)
+    assert ratings.index.equals(compact_scout_df.index)
+    names = compact_scout_df['Name'].astype(str).to_numpy()
+    for profile, stat_weights in POSITION_PROFILES.items():
+        # Players of the test exports have unique names
+        evaluation = evaluate_players_by_position(compact_scout_df, stat_weights)
+        expected = pd.Series(evaluation['Rating'].to_numpy(), index=evaluation['Name'].astype(str))
+        np.testing.assert_array_equal(ratings[profile].to_numpy(), expected[names].to_numpy())
+
+
+@pytest.mark.parametrize('n_players', [None, 0])
+def test_groups_same_as_evaluating_each_group(compact_scout_df, n_players):
+    df = compact_scout_df.iloc[:n_players]
+    grouped = evaluate_position_groups(df, WEIGHTS)
+    assert list(grouped.columns) == ['Group', 'Rank', 'Player ID', 'Rating']
+    assert list(grouped['Group'].unique()) == (list(POSITION_GROUPS) if len(df) else [])
+    for group, positions in POSITION_GROUPS.items():
+        members = apply_filter(df, filter_spec(positions=positions))
+        expected = evaluate_players_by_position(members, WEIGHTS)
+        pd.testing.assert_frame_equal(position_group_table(df, grouped, group, WEIGHTS), expected)
+        pd.testing.assert_frame_equal(position_group_table(df, grouped, group, WEIGHTS, top_k=5),
+                                      expected.head(5))
+        entries = grouped[grouped['Group'] == group]
+        assert list(entries['Rank']) == list(range(1, len(members) + 1))
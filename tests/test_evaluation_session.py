@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from evaluate_players_by_position import evaluate_players_by_position, raw_ratings
+from evaluation_session import EvaluationSession
+
+
+STATS = ['Tck/90', 'Int/90', 'Pas %', 'Fls', 'Drb/90', 'xA/90', 'Dist/90']
+
+
+def test_result_same_as_evaluation(compact_scout_df):
+    weights = {'Tck/90': 0.9, 'Int/90': 0.85, 'Fls': 0.4}
+    session = EvaluationSession(compact_scout_df, weights)
+    pd.testing.assert_frame_equal(session.result(), evaluate_players_by_position(compact_scout_df, weights))
+    pd.testing.assert_frame_equal(session.result(top_k=20),
+                                  evaluate_players_by_position(compact_scout_df, weights, top_k=20))
+
+
+@pytest.mark.parametrize('normalization', ['raw', 'percentile'])
+def test_updates_same_as_rating_from_scratch(compact_scout_df, normalization):
+    rng = np.random.default_rng(0)
+    session = EvaluationSession(compact_scout_df, normalization=normalization)
+    for _ in range(150):
+        stat = STATS[rng.integers(len(STATS))]
+        if stat in session.weights and rng.random() < 0.3:
+            session.remove_stat(stat)
+        else:
+            session.set_weight(stat, float(rng.integers(1, 20)) / 10)
+        if session.weights:
+            expected = raw_ratings(compact_scout_df, session.weights, normalization)
+            np.testing.assert_allclose(session.raw_ratings(), expected, rtol=1e-9, atol=1e-9)
+
+    session.rebuild()
+    pd.testing.assert_frame_equal(session.result(), evaluate_players_by_position(
+        compact_scout_df, session.weights, normalization=normalization))
+
+
+def test_invalid_weight(compact_scout_df):
+    session = EvaluationSession(compact_scout_df, {'Tck/90': 1})
+    with pytest.raises(ValueError):
+        session.set_weight('Int/90', -1)
+    assert session.weights == {'Tck/90': 1}
+
+
+@pytest.mark.parametrize('normalization', ['raw', 'percentile'])
+def test_no_players(compact_scout_df, normalization):
+    no_players = compact_scout_df.iloc[:0]
+    weights = {'Tck/90': 0.9, 'Int/90': 0.85}
+    session = EvaluationSession(no_players, weights, normalization=normalization, dataset=compact_scout_df)
+    assert len(session.ratings()) == 0
+    pd.testing.assert_frame_equal(session.result(top_k=10), evaluate_players_by_position(
+        no_players, weights, top_k=10, normalization=normalization, dataset=compact_scout_df))
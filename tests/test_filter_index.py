@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from filter_index import filter_index
+
+
+def expected_mask(df, positions=None, nationalities=None, divisions=None, ranges=None):
+    # The filters as a scan of the dataset
+    mask = np.ones(len(df), dtype=bool)
+    if positions:
+        mask &= np.array([bool(set(player_positions) & set(positions)) for player_positions in df['Position']])
+    if nationalities is not None:
+        mask &= df['Nat'].isin(nationalities).to_numpy()
+    if divisions is not None:
+        mask &= df['Division'].isin(divisions).to_numpy()
+    for column, (low, high) in (ranges or {}).items():
+        if low is not None:
+            mask &= (df[column] >= low).to_numpy()
+        if high is not None:
+            mask &= (df[column] <= high).to_numpy()
+    return mask
+
+
+FILTERS = [
+    {},
+    {'positions': ['DC']},
+    {'positions': ['AML', 'AMR', 'STC'], 'nationalities': ['ENG', 'FRA']},
+    {'nationalities': ['BRA'], 'divisions': ['Scottish Premiership']},
+    {'divisions': [], 'positions': ['GK']},
+    {'nationalities': ['Not a nation']},
+    {'ranges': {'Age': (20, 25), 'Salary': (None, 50_000)}},
+    {'positions': ['MC', 'DM'], 'ranges': {'Transfer Value': (1_000_000, None), 'Apps': (10, 30)}},
+]
+
+
+@pytest.mark.parametrize('spec', FILTERS)
+def test_mask_same_as_scan(scout_df, compact_scout_df, spec):
+    expected = expected_mask(scout_df, **spec)
+    np.testing.assert_array_equal(filter_index(scout_df).mask(**spec), expected)
+    np.testing.assert_array_equal(filter_index(compact_scout_df).mask(**spec), expected)
+
+
+def test_values_of_selected_players(scout_df):
+    index = filter_index(scout_df)
+    mask = index.mask(positions=['GK'])
+    goalkeepers = scout_df[mask]
+    assert index.present_values('Nat', mask) == sorted(goalkeepers['Nat'].unique())
+    assert index.value_range('Age', mask) == (goalkeepers['Age'].min(), goalkeepers['Age'].max())
+    assert index.value_range('Age', np.zeros(len(scout_df), dtype=bool)) is None
+
+
+def test_digest_of_equal_datasets(scout_df):
+    assert filter_index(scout_df.copy()).digest == filter_index(scout_df).digest
+    changed = scout_df.copy()
+    changed.loc[0, 'Age'] += 1
+    assert filter_index(changed).digest != filter_index(scout_df).digest
@@ -0,0 +1,21 @@
+import gc
+
+import pandas as pd
+
+from frame_cache import frame_cache
+
+
+def test_built_once_per_frame_and_dropped_with_it():
+    store = {}
+    built = []
+    df, other = pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': [1, 2]})
+
+    first = frame_cache(store, df, lambda frame: built.append(frame) or len(built))
+    assert frame_cache(store, df, lambda frame: built.append(frame) or len(built)) == first == 1
+    assert frame_cache(store, other, lambda frame: built.append(frame) or len(built)) == 2
+    assert len(store) == 2
+
+    built.clear()
+    del df
+    gc.collect()
+    assert list(store) == [id(other)]
@@ -0,0 +1,50 @@
+import io
+
+import pandas as pd
+import pytest
+
+from html_table_parser import count_fm_rows, iter_fm_table, read_fm_table
+
+
+TABLE = ("<table><tr><th>Name</th><th>Apps</th></tr>"
+         "<tr><td>A<br>B</td><td>1,200</td></tr>"
+         "<tr><td>C <br/> D</td><td>3</td></tr>"
+         "<tr><td>E &amp; F</td><td>-</td></tr></table>")
+
+
+def test_line_breaks_separate_words():
+    df = read_fm_table(io.StringIO(TABLE))
+    assert list(df['Name']) == ['A B', 'C D', 'E & F']
+
+
+def test_same_table_as_read_html():
+    pytest.importorskip('html5lib')
+    expected = pd.read_html(io.StringIO(TABLE), flavor='html5lib')[0]
+    pd.testing.assert_frame_equal(read_fm_table(io.StringIO(TABLE)), expected)
+
+
+def test_export_same_as_read_html(scout_html):
+    pytest.importorskip('html5lib')
+    expected = pd.read_html(io.StringIO(scout_html), flavor='html5lib')[0]
+    pd.testing.assert_frame_equal(read_fm_table(io.StringIO(scout_html)), expected)
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 1 << 16])
+def test_chunk_size_does_not_change_table(scout_html, chunk_size):
+    pd.testing.assert_frame_equal(read_fm_table(io.StringIO(scout_html), chunk_size=chunk_size),
+                                  read_fm_table(io.StringIO(scout_html)))
+
+
+def test_batches_make_up_the_table(scout_html):
+    full = read_fm_table(io.StringIO(scout_html))
+    batches = list(iter_fm_table(io.StringIO(scout_html), chunk_rows=128))
+    assert [len(batch) for batch in batches] == [128, 128, 128, 128, 88]
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), full, check_dtype=False)
+
+
+@pytest.mark.parametrize('make_file', [io.StringIO, lambda text: io.BytesIO(text.encode('utf-8'))])
+def test_count_rows_of_text_and_binary_files(scout_html, make_file):
+    file = make_file(scout_html)
+    file.read(10)
+    assert count_fm_rows(file, chunk_size=1000) == 601
+    assert file.tell() == 0
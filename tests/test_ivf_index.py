@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmark_similarity import synthetic_pool
+from evaluate_players_by_position import SIMILARITY_STATS, similarity_calculation
+from ivf_index import IVFIndex
+from player_index import PLAYER_ID
+
+
+@pytest.fixture(scope='module')
+def pool():
+    return synthetic_pool(20_000, SIMILARITY_STATS, seed=1)
+
+
+@pytest.fixture(scope='module')
+def index(pool):
+    return IVFIndex.build(pool, SIMILARITY_STATS, seed=1)
+
+
+def exact_top_k(pool, vector, k):
+    scores = cosine_similarity(pool.to_numpy(), vector.reshape(1, -1))[:, 0]
+    return pool.index[np.argsort(-scores, kind='stable')[:k]], np.sort(scores)[::-1][:k]
+
+
+def test_probing_every_list_is_exact(pool, index):
+    for row in (0, 17, 12_345):
+        vector = pool.iloc[row].to_numpy()
+        ids, scores = index.query(vector, top_k=10, n_probe=len(index.centroids))
+        expected_ids, expected_scores = exact_top_k(pool, vector, 10)
+        assert list(ids) == list(expected_ids)
+        np.testing.assert_allclose(scores, expected_scores, atol=1e-6)
+
+
+def test_recall_of_default_n_probe(pool, index):
+    queries = np.random.default_rng(0).choice(len(pool), 50, replace=False)
+    found = 0
+    for row in queries:
+        vector = pool.iloc[row].to_numpy()
+        ids, _ = index.query(vector, top_k=10)
+        found += len(set(ids) & set(exact_top_k(pool, vector, 10)[0]))
+    assert found / (10 * len(queries)) >= 0.9
+
+
+def test_constrained_query_finds_top_k_allowed_players(pool, index):
+    allowed = pool.index.to_numpy()[::97]
+    vector = pool.iloc[5].to_numpy()
+    ids, scores = index.query(vector, top_k=10, n_probe=1, ids=allowed)
+    assert len(ids) == 10 and set(ids) <= set(allowed)
+    exact_ids, _ = index.query(vector, top_k=10, n_probe=len(index.centroids), ids=allowed)
+    expected_ids, _ = exact_top_k(pool.loc[allowed], vector, 10)
+    assert list(exact_ids) == list(expected_ids)
+
+
+def test_saved_index_loads_memory_mapped(tmp_path, pool, index):
+    index.save(str(tmp_path / 'index'))
+    loaded = IVFIndex.load(str(tmp_path / 'index'))
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.stats == index.stats and loaded.n_probe == index.n_probe
+    vector = pool.iloc[3].to_numpy()
+    for result, expected in zip(loaded.query(vector, top_k=10), index.query(vector, top_k=10)):
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_similarity_calculation_with_index(compact_scout_df, squad_df):
+    # Every list probed, an exact search
+    index = IVFIndex.build(compact_scout_df, SIMILARITY_STATS, n_lists=8, n_probe=8)
+    similar = similarity_calculation(compact_scout_df, squad_df, 'Player 3', top_k=20, index=index)
+    exact = similarity_calculation(compact_scout_df, squad_df, 'Player 3', top_k=20)
+    assert list(similar.columns) == [PLAYER_ID, 'Name', 'Similarity']
+    np.testing.assert_allclose(similar['Similarity'], exact['Similarity'], atol=1e-6)
+    assert list(similar['Name']) == list(compact_scout_df['Name'].to_numpy()[similar[PLAYER_ID]])
+    with pytest.raises(ValueError):
+        similarity_calculation(compact_scout_df, squad_df, 'Player 3', stats=['Age', 'Salary'], index=index)
@@ -0,0 +1,131 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import percentileofscore
+
+from html_table_parser import iter_fm_table
+from load_cleaning_data import (ROLE_SCORE_DECIMALS, ROLES, STAT_COLUMNS, STAT_PROFILES, compact_dataset,
+                                load_cleaning_data, parse_apps, parse_columns, parse_salary, parse_stat_value,
+                                parse_transfer_value, percentile_ranks, with_columns)
+from player_index import PLAYER_ID
+from positions import mask_to_positions
+
+
+@pytest.mark.parametrize('n_players', [600, 0])
+def test_chunked_load_of_text_file_same_as_full_load(make_export, n_players):
+    html = make_export(n_players, seed=1)
+    expected = load_cleaning_data(io.StringIO(html))
+    df = load_cleaning_data(io.StringIO(html), chunk_rows=128)
+    assert len(df) == n_players
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_chunked_load_falls_back_to_full_load(scout_html, full_load, monkeypatch):
+    def failing_batches(data_path, chunk_rows):
+        # The streaming parser fails after the first batch
+        batches = iter_fm_table(data_path, chunk_rows)
+        yield next(batches)
+        raise ValueError("Unexpected layout")
+
+    monkeypatch.setattr('load_cleaning_data.iter_fm_table', failing_batches)
+    pd.testing.assert_frame_equal(load_cleaning_data(io.StringIO(scout_html), chunk_rows=128), full_load)
+
+
+def legacy_roles_calculation(df):
+    # The per-row implementation the vectorized one replaced, with the scores
+    # rounded as role_percentiles does: np.dot and a column sum differ in the
+    # last bits, which split players tied on a role differently
+    for role, weights in ROLES.items():
+        columns = list(weights.keys())
+        values = list(weights.values())
+        df[role] = df[columns].apply(lambda x: np.dot(x, values), axis=1).round(ROLE_SCORE_DECIMALS)
+        df[role] = df[role].apply(lambda x: round(percentileofscore(df[role], x, kind='rank'), 2))
+
+
+def test_roles_same_as_per_row_implementation(scout_html):
+    df = load_cleaning_data(io.StringIO(scout_html))
+    expected = load_cleaning_data(io.StringIO(scout_html), rank_roles=False)
+    legacy_roles_calculation(expected)
+    pd.testing.assert_frame_equal(df[list(ROLES)], expected[list(ROLES)])
+
+
+def test_percentile_ranks_same_as_percentileofscore():
+    values = np.array([3.0, 1.0, 3.0, 0.0, 2.5, 3.0, 1.0])
+    expected = [round(percentileofscore(values, x, kind='rank'), 2) for x in values]
+    assert list(percentile_ranks(values)) == expected
+
+
+@pytest.fixture(scope='module')
+def full_load(scout_html):
+    return load_cleaning_data(io.StringIO(scout_html))
+
+
+def test_full_load(full_load):
+    assert len(full_load) == 600
+    assert full_load.index.name == PLAYER_ID and list(full_load.index) == list(range(600))
+    assert list(full_load['Name'][:2]) == ['Player 0', 'Player 1']
+    assert not full_load['Division'].str.startswith('cinch').any()
+    for role in ROLES:
+        assert full_load[role].between(0, 100).all()
+
+
+def test_chunked_load_of_path_same_as_full_load(scout_file, full_load):
+    pd.testing.assert_frame_equal(load_cleaning_data(str(scout_file), chunk_rows=100), full_load)
+
+
+def test_compact_chunked_load_same_as_compact_load(scout_file):
+    expected = load_cleaning_data(str(scout_file), compact=True)
+    pd.testing.assert_frame_equal(load_cleaning_data(str(scout_file), chunk_rows=100, compact=True), expected)
+
+
+def test_compact_layout_keeps_values(full_load):
+    compact = compact_dataset(full_load)
+    assert compact.memory_usage(deep=True).sum() < full_load.memory_usage(deep=True).sum()
+    assert [mask_to_positions(mask) for mask in compact['Position']] == list(full_load['Position'])
+    for column in ['Age', 'Salary', 'Transfer Value', 'Apps', 'Mins']:
+        np.testing.assert_array_equal(compact[column], full_load[column])
+    for column in ['Dist/90', 'Conv %', 'Assister']:
+        np.testing.assert_allclose(compact[column], full_load[column], rtol=1e-6)
+
+
+@pytest.mark.parametrize('columns', ['ST', ['Drb/90', 'Defensive Actions/90', 'Finisher']])
+def test_projected_load_same_as_full_load(scout_html, full_load, columns):
+    df = load_cleaning_data(io.StringIO(scout_html), columns=columns)
+    loaded = list(df.columns)
+    pd.testing.assert_frame_equal(pd.DataFrame(df[loaded]), full_load[loaded])
+    # Deferred stats and roles are cleaned when first selected
+    deferred = ['Hdr %', 'Distance', 'Pens Saved Ratio', 'Reader']
+    assert not set(deferred) & set(loaded)
+    pd.testing.assert_frame_equal(pd.DataFrame(df[deferred]), full_load[deferred])
+    pd.testing.assert_frame_equal(pd.DataFrame(with_columns(df, list(full_load.columns))),
+                                  full_load, check_like=True)
+
+
+def test_profiles_are_stats_of_the_exports():
+    for stats in STAT_PROFILES.values():
+        assert set(stats) <= set(STAT_COLUMNS)
+
+
+def test_projected_load_of_unknown_column(scout_html):
+    with pytest.raises(ValueError):
+        load_cleaning_data(io.StringIO(scout_html), columns=['Not a stat'])
+
+
+@pytest.mark.parametrize('parser, cells, expected', [
+    (parse_salary, ['£45,000 p/w', '€1,200 p/m', '-', 'nan'], [45_000, 1_200, 0, 0]),
+    (parse_transfer_value, ['£500K', '£1M - £3M', 'Not for Sale', 'Unknown'], [500_000, 2_000_000, 1e9, np.nan]),
+    (parse_apps, ['23 (4)', '12', '-'], [27, 12, 0]),
+    (parse_stat_value, ['-', '45%', '12.3km', '0.35'], [0, 45, 12.3, 0.35]),
+])
+def test_parse_rules(parser, cells, expected):
+    np.testing.assert_array_equal([parser(cell) for cell in cells], expected)
+
+
+def test_columns_parsed_once_per_value_same_as_per_cell():
+    columns = [pd.Series([' 1.5', '-', '20%', None, '1.5']), pd.Series(['3km', '-', ' 1.5', '7', '0'])]
+    parsed = parse_columns(columns, parse_stat_value)
+    expected = [[parse_stat_value(str(cell.strip() if isinstance(cell, str) else np.nan)) for cell in column]
+                for column in columns]
+    np.testing.assert_array_equal(parsed, expected)
@@ -0,0 +1,35 @@
+import io
+
+import pandas as pd
+import pytest
+
+from load_cleaning_data import load_cleaning_data, role_percentiles
+from parallel_loading import load_many
+
+
+@pytest.fixture(scope='module')
+def exports(make_export):
+    return [make_export(200, seed=seed) for seed in (3, 4, 5)]
+
+
+def test_merged_dataset_same_as_files_loaded_one_by_one(exports):
+    frames = [load_cleaning_data(io.StringIO(html), rank_roles=False) for html in exports]
+    expected = pd.concat(frames, ignore_index=True)
+    role_percentiles(expected)
+
+    df = load_many([io.BytesIO(html.encode('utf-8')) for html in exports], max_workers=1)
+    assert list(df['Source File'].unique()) == ['File 1', 'File 2', 'File 3']
+    assert list(df.index) == list(range(600))
+    pd.testing.assert_frame_equal(df.drop(columns='Source File'), expected, check_categorical=False,
+                                  check_index_type=False, check_names=False)
+
+
+def test_workers_give_the_same_dataset(tmp_path, exports):
+    paths = []
+    for i, html in enumerate(exports):
+        paths.append(str(tmp_path / f"scout_{i}.html"))
+        with open(paths[-1], 'w', encoding='utf-8') as file:
+            file.write(html)
+    df = load_many(paths, max_workers=2, compact=True)
+    assert list(df['Source File'].unique()) == ['scout_0.html', 'scout_1.html', 'scout_2.html']
+    pd.testing.assert_frame_equal(df, load_many(paths, max_workers=1, compact=True))
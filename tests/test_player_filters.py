@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from player_filters import apply_filter, filter_mask, filter_rows, filter_spec, normalize_spec, spec_key
+from filter_index import filter_index
+
+
+def test_equal_filters_give_equal_specs():
+    spec = filter_spec(['FRA', 'ENG', 'FRA'], None, ['DM', 'DC'], {'Age': (np.int64(18), 30), 'Mins': (None, None)})
+    assert spec == {'nationalities': ['ENG', 'FRA'], 'divisions': None, 'positions': ['DC', 'DM'],
+                    'ranges': {'Age': [18, 30]}}
+    assert spec_key(spec) == spec_key({'positions': ['DC', 'DM'], 'nationalities': ['ENG', 'FRA'],
+                                       'ranges': {'Age': [18, 30]}})
+
+
+@pytest.mark.parametrize('spec', [{'teams': ['A']}, {'ranges': {'Name': ['A', 'B']}}])
+def test_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        normalize_spec(spec)
+
+
+def test_filter_rows_same_as_index_mask(scout_df):
+    spec = filter_spec(nationalities=['ENG', 'ESP'], positions=['AMC', 'STC'], ranges={'Age': (None, 28)})
+    expected = filter_index(scout_df).mask(['AMC', 'STC'], ['ENG', 'ESP'], None, {'Age': (None, 28)})
+    rows = filter_rows(scout_df, spec)
+    np.testing.assert_array_equal(rows, np.flatnonzero(expected))
+    np.testing.assert_array_equal(filter_mask(scout_df, spec), expected)
+    assert apply_filter(scout_df, spec).index.equals(scout_df.index[expected])
+
+    # Memoized and read-only
+    assert filter_rows(scout_df, dict(spec)) is rows
+    with pytest.raises(ValueError):
+        rows[0] = 0
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from player_index import PLAYER_ID, player_index, player_row
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({'Name': ['A', 'B', 'A', 'C'], 'Age': [20, 21, 22, 23]},
+                        index=pd.Index([10, 11, 12, 13], name=PLAYER_ID))
+
+
+def test_lookups(df):
+    index = player_index(df)
+    assert player_index(df) is index
+    assert list(index.positions('A')) == [0, 2]
+    assert index.id_of('A') == 10 and index.name_of(13) == 'C'
+    assert player_row(df, 'A')['Age'] == 20
+    assert player_row(df, player_id=12)['Age'] == 22
+    assert len(index.positions('D')) == 0
+
+
+def test_missing_players(df):
+    with pytest.raises(KeyError):
+        player_row(df, 'D')
+    with pytest.raises(KeyError):
+        player_row(df, player_id=99)
+
+
+def test_ids_are_rows_of_the_export(scout_df):
+    assert scout_df.index.name == PLAYER_ID
+    assert player_row(scout_df, 'Player 42').name == 42
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+import positions
+from positions import (POSITION_BITS, POSITIONS, decode_position, decode_positions, format_positions,
+                       has_any_position, mask_to_positions)
+
+
+def test_decode_position():
+    positions, mask = decode_position('D/WB (L), AM (RL)')
+    assert positions == {'DL', 'WBL', 'AML', 'AMR'}
+    assert mask_to_positions(mask) == positions
+    assert format_positions(mask) == 'DL, WBL, AML, AMR'
+    assert decode_position(np.nan) == (frozenset(), 0)
+
+
+def test_unknown_positions_are_left_out_of_masks():
+    bits = dict(POSITION_BITS)
+    positions, mask = decode_position('XX (Q), D (C)')
+    assert positions == {'XXQ', 'DC'}
+    assert mask == POSITION_BITS['DC']
+    # The bits of the known positions never change
+    assert POSITION_BITS == bits and len(POSITIONS) == len(bits)
+
+
+def test_masks_and_sets_select_the_same_players():
+    column = pd.Series(['GK', 'D (RC), DM', 'ST (C)', 'M/AM (RLC)', np.nan, 'D (RC), DM'])
+    sets, masks = decode_positions(column)
+    assert list(sets) == [{'GK'}, {'DR', 'DC', 'DM'}, {'STC'}, {'MR', 'ML', 'MC', 'AMR', 'AML', 'AMC'}, set(),
+                          {'DR', 'DC', 'DM'}]
+    for selected in (['DC'], ['AMC', 'STC'], ['GK', 'DM'], []):
+        np.testing.assert_array_equal(has_any_position(pd.Series(sets), selected),
+                                      has_any_position(pd.Series(masks), selected))
+
+
+def test_each_distinct_string_decoded_once(monkeypatch):
+    calls = []
+    split = positions.split_positions
+    monkeypatch.setattr(positions, 'split_positions', lambda text: calls.append(text) or split(text))
+    monkeypatch.setattr(positions, 'DECODED_POSITIONS', {})
+    sets, masks = decode_positions(pd.Series(['DM', 'GK', 'DM', 'DM', 'GK', 'AM (C)']))
+    assert calls == ['DM', 'GK', 'AM (C)']
+    # Players with the same position string share one set
+    assert sets[0] is sets[2] and sets[1] is not sets[0]
+    decode_positions(pd.Series(['GK', 'AM (C)']))
+    assert calls == ['DM', 'GK', 'AM (C)']
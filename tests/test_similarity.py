@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from evaluate_players_by_position import SIMILARITY_STATS, replacement_matrix, similarity_calculation
+import similarity_index
+from player_filters import apply_filter, filter_spec
+from player_index import PLAYER_ID
+from positions import mask_to_positions
+
+
+def assert_same_similarities(similar, df_scout, vector, stats=SIMILARITY_STATS):
+    # Same similarity as sklearn for every player, most similar first
+    expected = cosine_similarity(df_scout[stats].to_numpy(dtype=float), vector.reshape(1, -1))[:, 0]
+    np.testing.assert_allclose(similar['Similarity'], expected[df_scout.index.get_indexer(similar[PLAYER_ID])],
+                               atol=1e-12)
+    assert (np.diff(similar['Similarity']) <= 1e-12).all()
+
+
+def test_same_as_cosine_similarity(compact_scout_df, squad_df):
+    similar = similarity_calculation(compact_scout_df, squad_df, 'Player 3')
+    assert len(similar) == len(compact_scout_df) and similar[PLAYER_ID].is_unique
+    assert list(similar['Name']) == list(compact_scout_df['Name'].to_numpy()[similar[PLAYER_ID]])
+    assert_same_similarities(similar, compact_scout_df, squad_df.loc[3, SIMILARITY_STATS].to_numpy(dtype=float))
+
+
+@pytest.mark.parametrize('top_k', [1, 10, 200])
+def test_top_k_same_as_head_of_all_players(compact_scout_df, squad_df, top_k):
+    similar = similarity_calculation(compact_scout_df, squad_df, None, player_id=7)
+    pd.testing.assert_frame_equal(similarity_calculation(compact_scout_df, squad_df, None, player_id=7, top_k=top_k),
+                                  similar.head(top_k).reset_index(drop=True))
+
+
+@pytest.mark.parametrize('block_cells', [similarity_index.MAX_BLOCK_CELLS, 1_000])
+@pytest.mark.parametrize('same_position', [False, True])
+def test_replacements_same_as_querying_each_player(compact_scout_df, squad_df, monkeypatch, block_cells,
+                                                   same_position):
+    # Small blocks merge the best players of many blocks
+    monkeypatch.setattr(similarity_index, 'MAX_BLOCK_CELLS', block_cells)
+    replacements = replacement_matrix(compact_scout_df, squad_df, top_k=5, same_position=same_position)
+    assert list(replacements.columns) == ['Squad ID', 'Squad Player', 'Rank', PLAYER_ID, 'Name', 'Position',
+                                          'Similarity']
+    for squad_id, candidates in replacements.groupby('Squad ID', sort=False):
+        spec = None
+        if same_position:
+            spec = filter_spec(positions=sorted(mask_to_positions(squad_df.loc[squad_id, 'Position'])))
+        expected = similarity_calculation(compact_scout_df, squad_df, None, player_id=squad_id, top_k=5, spec=spec)
+        assert list(candidates['Rank']) == list(range(1, len(expected) + 1))
+        assert list(candidates[PLAYER_ID]) == list(expected[PLAYER_ID])
+        np.testing.assert_allclose(candidates['Similarity'], expected['Similarity'], atol=1e-12)
+    assert list(replacements['Squad ID'].unique()) == list(squad_df.index)
+
+
+SPEC = {'positions': ['DC', 'DM'], 'ranges': {'Age': [None, 27]}}
+
+
+def test_constrained_search_same_as_filtering_results(compact_scout_df, squad_df):
+    spec = filter_spec(**SPEC)
+    allowed = set(apply_filter(compact_scout_df, spec).index)
+    similar = similarity_calculation(compact_scout_df, squad_df, 'Player 3')
+    expected = similar[similar[PLAYER_ID].isin(allowed)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(similarity_calculation(compact_scout_df, squad_df, 'Player 3', spec=spec), expected)
+    pd.testing.assert_frame_equal(similarity_calculation(compact_scout_df, squad_df, 'Player 3', top_k=10, spec=spec),
+                                  expected.head(10))
+
+
+def test_constrained_replacements_same_as_filtering_candidates(compact_scout_df, squad_df):
+    spec = filter_spec(**SPEC)
+    replacements = replacement_matrix(compact_scout_df, squad_df, top_k=3, spec=spec)
+    expected = replacement_matrix(apply_filter(compact_scout_df, spec), squad_df, top_k=3)
+    pd.testing.assert_frame_equal(replacements, expected)
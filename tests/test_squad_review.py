@@ -0,0 +1,78 @@
+import threading
+
+from squad_review import GeminiBackend, ReviewService, StubBackend, review_backend, squad_prompt
+
+
+class ControlledBackend:
+    """
+    Backend whose reviews finish when the test releases them.
+    """
+
+    name = 'controlled'
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        self.release.wait(5)
+        if 'fail' in prompt:
+            raise RuntimeError('no review')
+        return f"review of {prompt}"
+
+
+def wait(service, key):
+    service._reviews[key].exception(timeout=5)
+    return service.result(key)
+
+
+def test_reviews_generated_in_the_background_once_per_prompt():
+    backend = ControlledBackend()
+    service = ReviewService(backend)
+    key = service.request('squad')
+    assert service.result(key) == ('pending', None)
+    assert service.request('squad') == key
+
+    backend.release.set()
+    assert wait(service, key) == ('done', 'review of squad')
+    service.request('squad')
+    assert backend.prompts == ['squad']
+    assert service.result('unknown') == ('missing', None)
+
+
+def test_failed_reviews_are_generated_again():
+    backend = ControlledBackend()
+    backend.release.set()
+    service = ReviewService(backend)
+    key = service.request('fail')
+    assert wait(service, key) == ('failed', 'no review')
+    service.request('fail')
+    assert wait(service, key)[0] == 'failed'
+    assert backend.prompts == ['fail', 'fail']
+
+
+def test_oldest_reviews_dropped():
+    backend = ControlledBackend()
+    backend.release.set()
+    service = ReviewService(backend, max_cached=2)
+    keys = [service.request(prompt) for prompt in ('a', 'b')]
+    for key in keys:
+        wait(service, key)
+    service.request('c')
+    assert service.result(keys[0]) == ('missing', None)
+    assert service.result(keys[1])[0] == 'done'
+
+
+def test_backend_from_key(monkeypatch, squad_df):
+    monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+    assert isinstance(review_backend(), StubBackend)
+    assert isinstance(review_backend('key'), GeminiBackend)
+    monkeypatch.setenv('GEMINI_API_KEY', 'key')
+    assert review_backend().api_key == 'key'
+
+    prompt = squad_prompt(squad_df)
+    assert 'Player 0' in prompt
+    service = ReviewService(StubBackend())
+    assert wait(service, service.request(prompt))[0] == 'done'
+    assert service.key(prompt) != ReviewService(ControlledBackend()).key(prompt)
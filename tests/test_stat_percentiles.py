@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy.stats import percentileofscore
+
+from evaluate_players_by_position import evaluate_players_by_position, scale_ratings
+from player_filters import apply_filter, filter_spec
+from stat_percentiles import stat_table, table_stats
+
+
+STATS = ['Tck/90', 'Conv %', 'Salary', 'Age', 'Finisher']
+
+
+def test_percentiles_same_as_percentileofscore(compact_scout_df):
+    table = stat_table(compact_scout_df)
+    for stat in STATS:
+        values = compact_scout_df[stat].to_numpy(dtype=float)
+        expected = [round(percentileofscore(values, x, kind='rank'), 2) for x in values]
+        np.testing.assert_allclose(table.column(stat), expected, atol=1e-4)
+        low, high = values.min(), values.max()
+        np.testing.assert_allclose(table.column(stat, 'minmax'), (values - low) / (high - low), atol=1e-6)
+
+
+def test_table_built_once_per_dataset(compact_scout_df):
+    table = stat_table(compact_scout_df, table_stats(compact_scout_df))
+    assert stat_table(compact_scout_df) is table
+    assert set(table_stats(compact_scout_df)) <= set(table.percentiles)
+    assert 'Position' not in table.percentiles and 'Name' not in table.percentiles
+    with pytest.raises(ValueError):
+        table.column('Tck/90', 'zscore')
+
+
+def test_rows_of_filtered_players(compact_scout_df):
+    table = stat_table(compact_scout_df)
+    filtered = apply_filter(compact_scout_df, filter_spec(positions=['STC']))
+    frame = table.frame(STATS, df=filtered)
+    assert frame.index.equals(filtered.index)
+    np.testing.assert_array_equal(frame['Tck/90'], table.column('Tck/90')[compact_scout_df.index.get_indexer(
+        filtered.index)])
+    with pytest.raises(ValueError):
+        table.rows_of(compact_scout_df.set_axis(compact_scout_df.index + 10_000))
+
+
+def test_percentile_of_other_players(compact_scout_df):
+    values = np.array([0.0, 1.25, 3.0, 100.0])
+    column = compact_scout_df['Tck/90'].to_numpy(dtype=float)
+    expected = [percentileofscore(column, value, kind='rank') for value in values]
+    np.testing.assert_allclose(stat_table(compact_scout_df).percentile_of('Tck/90', values), expected)
+
+
+def test_percentile_evaluation_ranks_in_the_dataset(compact_scout_df):
+    weights = {'Tck/90': 1, 'Salary': 1}
+    filtered = apply_filter(compact_scout_df, filter_spec(positions=['DC']))
+    result = evaluate_players_by_position(filtered, weights, normalization='percentile', dataset=compact_scout_df)
+    table = stat_table(compact_scout_df)
+    rows = compact_scout_df.index.get_indexer(filtered.index)
+    raw = (table.column('Tck/90')[rows].astype(float) + table.column('Salary')[rows].astype(float)) / 2 * 100
+    ratings = scale_ratings(raw)
+    order = np.argsort(-ratings, kind='stable')
+    assert list(result['Name']) == list(filtered['Name'].to_numpy()[order])
+    np.testing.assert_array_equal(result['Rating'], ratings[order])
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from table_sorting import frame_state, rank_rows, sort_order
+
+
+def full_sort(ratings):
+    # Descending, ties in dataset order, missing ratings last
+    return sorted(range(len(ratings)), key=lambda row: (np.isnan(ratings[row]), -np.nan_to_num(ratings[row]), row))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_top_k_same_as_head_of_full_sort(seed):
+    rng = np.random.default_rng(seed)
+    ratings = rng.integers(0, 20, 300).astype(float)
+    ratings[rng.choice(300, 15, replace=False)] = np.nan
+    expected = full_sort(ratings)
+    assert list(rank_rows(ratings)) == expected
+    for top_k in (0, 1, 7, 50, 299, 300, 400):
+        assert list(rank_rows(ratings, top_k)) == expected[:top_k]
+
+
+def test_sort_orders_cached_per_table():
+    df = pd.DataFrame({'Rating': [2.0, np.nan, 3.0, 2.0], 'Name': ['b', 'a', 'd', 'c']}, index=[7, 5, 6, 4])
+    order = sort_order(df, 'Rating', ascending=False)
+    assert list(order) == [2, 0, 3, 1]
+    assert sort_order(df, 'Rating', ascending=False) is order
+    assert list(sort_order(df, 'Rating')) == [0, 3, 2, 1]
+    assert list(sort_order(df, 'Name')) == [1, 0, 3, 2]
+    assert frame_state(df) is frame_state(df) and frame_state(df.copy()) is not frame_state(df)
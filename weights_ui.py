@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from positions import POSITION_PROFILES
 
 def select_similarity_stats():
     st.header("🔍 Select Similarity Stats")
@@ -56,6 +57,9 @@ def get_stat_weights_ui():
         weight = st.number_input(f"Weight for {stat}", min_value=0.0, max_value=1.0, value=0.5, step=0.05)
         stat_weights[stat] = weight
 
+    # Weights as currently entered, for the live preview of the ratings
+    st.session_state.draft_stat_weights = stat_weights
+
     if st.button("Submit Weights"):
         st.success("Weights submitted successfully!")
         return stat_weights
@@ -68,17 +72,9 @@ def get_stat_weights_ui():
 def show_position_guide():
     st.subheader("📘 Recommended Stats per Position")
 
-    data = [
-        ("Goalkeeper (GK)", "Sv %", 0.95, "Sv/90", 0.85, "Cln/90", 0.75, "Pens Saved", 0.70, "xGP", 0.60, "All/90", 0.50, "Shutouts", 0.65),
-        ("Centre Back (CB)", "Hdr %", 0.90, "Clr/90", 0.85, "Tck/90", 0.80, "Int/90", 0.75, "Blk/90", 0.70, "Hdrs W/90", 0.65, "Yel", 0.30),
-        ("Fullback (FB/WB)", "Crs A/90", 0.85, "Drb/90", 0.75, "Tck/90", 0.70, "Int/90", 0.65, "OP-KP/90", 0.60, "Ps C/90", 0.55, "Pas %", 0.50),
-        ("Defensive Mid (DM)", "Tck/90", 0.90, "Int/90", 0.85, "Pr passes/90", 0.70, "Pas %", 0.65, "Blk/90", 0.60, "K Tck/90", 0.55, "Fls", 0.40),
-        ("Centre Mid (CM)", "xA/90", 0.80, "Pr passes/90", 0.75, "Int/90", 0.70, "Ps C/90", 0.65, "K Pas/90", 0.60, "Tck/90", 0.55, "Drb/90", 0.50),
-        ("Attacking Mid (AM)", "xA/90", 0.90, "OP-KP/90", 0.85, "Ch C/90", 0.75, "Drb/90", 0.70, "Gls/90", 0.65, "xG/90", 0.60, "Pas %", 0.50),
-        ("Winger (LW/RW)", "Crs A/90", 0.90, "xA/90", 0.85, "Drb/90", 0.80, "OP-KP/90", 0.75, "Gls/90", 0.60, "Shot %", 0.50, "Tck/90", 0.45),
-        ("Striker (ST)", "xG/90", 1.00, "Gls/90", 0.95, "Conv %", 0.85, "xG/shot", 0.80, "ShT/90", 0.75, "Asts/90", 0.60, "Shot %", 0.55),
-    ]
+    data = [(profile, *[item for stat_weight in weights.items() for item in stat_weight])
+            for profile, weights in POSITION_PROFILES.items()]
 
-    columns = ["Position"] + [f"Stat {i}" for i in range(1, 8)] + [f"W{i}" for i in range(1, 8)]
+    columns = ["Position"] + [column for i in range(1, 8) for column in (f"Stat {i}", f"W{i}")]
     df_guide = pd.DataFrame(data, columns=columns)
     st.dataframe(df_guide)